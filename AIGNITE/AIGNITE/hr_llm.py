@@ -1,11 +1,15 @@
 from flask import Flask, render_template, request, jsonify, session
-import requests
-import os
+import hashlib
+import uuid
 from werkzeug.utils import secure_filename
-import pytesseract
-from PIL import Image
-import fitz  
-from docx import Document
+from llm_client import GroqClient
+from llm_cache import cache_from_env
+from llm_scheduler import scheduler_from_env
+from llm_usage import usage_from_env
+from question_bank import BANK_CATEGORIES, QuestionBank
+from resume_cache import resume_cache_from_env, upload_store_from_env
+from resume_parser import HR_RESUME_TEXT_KEY, RESUME_TEXT_CHARS, hr_resume_text
+from ocr_jobs import ocr_queue_from_env
 from search_engine import DuckDuckGoSearch
 
 app = Flask(__name__)
@@ -13,12 +17,20 @@ app.secret_key = 'your-secret-key-hr'
 app.config['UPLOAD_FOLDER'] = 'uploads'
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024
 
-if not os.path.exists('uploads'):
-    os.makedirs('uploads')
+# Pooled Groq client shared by every route; main questions are served from the response cache
+groq_client = GroqClient(cache=cache_from_env(), scheduler=scheduler_from_env(), usage=usage_from_env())
 
-def load_api_key():
-    with open('key.txt', 'r') as f:
-        return f.read().strip().replace('API: ', '')
+# Pre-generated company/role questions (see question_bank.py); None until a bank is built
+question_bank = QuestionBank.from_env()
+
+# Text already extracted from identical uploads, keyed by content hash
+resume_cache = resume_cache_from_env()
+
+# Optional content-addressed copies of uploads; parsing itself never touches the disk
+upload_store = upload_store_from_env(app.config['UPLOAD_FOLDER'])
+
+# Process pool for OCR of image and scanned-PDF resumes, with per-page and per-job timeouts
+ocr_queue = ocr_queue_from_env()
 
 def extract_name_from_resume(resume_text):
     """Extract candidate name from resume text"""
@@ -30,70 +42,12 @@ def extract_name_from_resume(resume_text):
                 return line
     return 'Candidate'
 
-def extract_text_from_file(filepath):
-    filename = os.path.basename(filepath).lower()
-    
-    if filename.endswith('.txt'):
-        with open(filepath, 'r', encoding='utf-8') as f:
-            return f.read()
-    
-    elif filename.endswith('.pdf'):
-        doc = fitz.open(filepath)
-        text = ""
-        for page_num in range(len(doc)):
-            page = doc.load_page(page_num)
-            text += page.get_text()
-            blocks = page.get_text("dict")
-            for block in blocks["blocks"]:
-                if "lines" in block:
-                    for line in block["lines"]:
-                        for span in line["spans"]:
-                            text += span["text"] + " "
-        doc.close()
-        return text.strip()
-    
-    elif filename.endswith('.docx'):
-        doc = Document(filepath)
-        text = ""
-        for paragraph in doc.paragraphs:
-            text += paragraph.text + "\n"
-        return text
-    
-    elif filename.endswith(('.png', '.jpg', '.jpeg', '.bmp', '.tiff')):
-        image = Image.open(filepath)
-        return pytesseract.image_to_string(image)
-    
-    else:
-        return f"Unsupported file format: {filename}"
-
-def groq_chat(messages, api_key=None):
-    if not api_key:
-        api_key = load_api_key()
-    
-    url = "https://api.groq.com/openai/v1/chat/completions"
-    headers = {
-        "Authorization": f"Bearer {api_key}",
-        "Content-Type": "application/json"
-    }
-    
-    data = {
-        "messages": messages,
-        "model": "llama-3.1-8b-instant",
-        "temperature": 0.7
-    }
-    
-    try:
-        response = requests.post(url, headers=headers, json=data, timeout=30)
-        if response.headers.get('content-type', '').startswith('application/json'):
-            return response.json()
-        else:
-            return {'error': {'message': 'Invalid response format', 'type': 'format_error'}}
-    except requests.exceptions.Timeout:
-        return {'error': {'message': 'Request timed out. Please try again.', 'type': 'timeout'}}
-    except requests.exceptions.ConnectionError:
-        return {'error': {'message': 'Connection failed. Please check your internet connection.', 'type': 'connection_error'}}
-    except Exception as e:
-        return {'error': {'message': str(e), 'type': 'unknown_error'}}
+def read_resume(data, filename):
+    """Start of the resume text; images and scanned pages are OCR'd in the OCR worker pool"""
+    text = hr_resume_text(data, filename, skip_scanned=ocr_queue is not None)
+    if text is None:
+        return ocr_queue.extract(data, filename, RESUME_TEXT_CHARS)
+    return text
 
 @app.route('/')
 def index():
@@ -118,16 +72,22 @@ def upload_resume():
         return jsonify({'error': 'No file selected'}), 400
     
     filename = secure_filename(file.filename)
-    filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-    file.save(filepath)
+    data = file.read()
+    if upload_store:
+        upload_store.save(data, filename)
     
-    resume_content = extract_text_from_file(filepath)
+    if resume_cache:
+        resume_content = resume_cache.extract(data, filename, read_resume, extractor=HR_RESUME_TEXT_KEY)
+    else:
+        resume_content = read_resume(data, filename)
     candidate_name = extract_name_from_resume(resume_content)
     
     # Initialize search engine for HR context
     search_engine = DuckDuckGoSearch()
     company_data = search_engine.search_company_info(company)
     
+    # Identifies this interview to the scheduler's fair queueing and the usage counters
+    session['hr_session_id'] = str(uuid.uuid4())
     session['candidate_name'] = candidate_name
     session['resume_content'] = resume_content
     session['role'] = role
@@ -148,10 +108,12 @@ def upload_resume():
     
     session['messages'] = [{"role": "system", "content": tone}]
     
-    result = groq_chat(session['messages'])
+    result = groq_client.chat(session['messages'], session_id=session['hr_session_id'], call_site='first_question')
     if 'choices' in result and len(result['choices']) > 0:
         first_question = result['choices'][0]['message']['content']
         session['messages'].append({"role": "assistant", "content": first_question})
+        session['asked_questions'] = [first_question]
+        session['asked_prompts'] = []
         return jsonify({
             'message': 'Resume uploaded successfully', 
             'first_question': first_question,
@@ -184,7 +146,8 @@ def chat_endpoint():
     
     session['messages'].append({"role": "system", "content": prompt})
     
-    result = groq_chat(session['messages'])
+    result = groq_client.chat(session['messages'], use_cache=False, session_id=session.get('hr_session_id'),
+                              call_site='follow_up')
     if 'choices' in result and len(result['choices']) > 0:
         assistant_message = result['choices'][0]['message']['content']
         session['messages'].append({"role": "assistant", "content": assistant_message})
@@ -203,6 +166,35 @@ def chat_endpoint():
 def handle_skip():
     return get_next_main_question()
 
+def main_question_prompt(question_count, difficulty, company, role, resume_content, company_data):
+    """Return (category, prompt) for the main question at question_count"""
+    if question_count < 2:
+        category = 'resume'
+        if difficulty == 'easy':
+            prompt = f"Ask a different basic HR question about career goals or motivation from your resume. Be supportive. 10-12 words. Resume: {resume_content[:500]}"
+        elif difficulty == 'hard':
+            prompt = f"Ask a challenging HR question about conflicts or failures mentioned in your resume experience. Be probing. 10-12 words. Resume: {resume_content[:500]}"
+        else:
+            prompt = f"Ask an HR question about communication or collaboration from your resume projects. Be professional. 10-12 words. Resume: {resume_content[:500]}"
+    elif question_count < 4:
+        category = 'company'
+        company_context = ' '.join([item['content'][:100] for item in company_data[:2]])
+        if difficulty == 'easy':
+            prompt = f"Ask basic HR question about {company} culture. Context: {company_context}. 10-12 words."
+        elif difficulty == 'hard':
+            prompt = f"Ask challenging HR question about {company} values fit. Context: {company_context}. 10-12 words."
+        else:
+            prompt = f"Ask HR question about {company} growth opportunities. Context: {company_context}. 10-12 words."
+    else:
+        category = 'role'
+        if difficulty == 'easy':
+            prompt = f"Ask basic HR question about {role} role interest or daily responsibilities understanding. 10-12 words."
+        elif difficulty == 'hard':
+            prompt = f"Ask challenging HR question about {role} role challenges or performance under pressure. 10-12 words."
+        else:
+            prompt = f"Ask HR question about {role} role strengths or professional development plans. 10-12 words."
+    return category, prompt
+
 def get_next_main_question():
     session['question_count'] += 1
     session['sub_question_count'] = 0
@@ -216,57 +208,43 @@ def get_next_main_question():
     difficulty = session.get('difficulty', 'medium')
     
     # Determine category and question type
-    if session['question_count'] < 2:
-        session['current_category'] = 'resume'
-        if difficulty == 'easy':
-            prompt = f"Ask a different basic HR question about career goals or motivation from your resume. Be supportive. 10-12 words. Resume: {session['resume_content'][:500]}"
-        elif difficulty == 'hard':
-            prompt = f"Ask a challenging HR question about conflicts or failures mentioned in your resume experience. Be probing. 10-12 words. Resume: {session['resume_content'][:500]}"
-        else:
-            prompt = f"Ask an HR question about communication or collaboration from your resume projects. Be professional. 10-12 words. Resume: {session['resume_content'][:500]}"
-    elif session['question_count'] < 4:
-        session['current_category'] = 'company'
-        company_context = ' '.join([item['content'][:100] for item in session.get('company_data', [])[:2]])
-        if difficulty == 'easy':
-            prompt = f"Ask basic HR question about {session['company']} culture. Context: {company_context}. 10-12 words."
-        elif difficulty == 'hard':
-            prompt = f"Ask challenging HR question about {session['company']} values fit. Context: {company_context}. 10-12 words."
-        else:
-            prompt = f"Ask HR question about {session['company']} growth opportunities. Context: {company_context}. 10-12 words."
-    else:
-        session['current_category'] = 'role'
-        if difficulty == 'easy':
-            prompt = f"Ask basic HR question about {session['role']} role interest or daily responsibilities understanding. 10-12 words."
-        elif difficulty == 'hard':
-            prompt = f"Ask challenging HR question about {session['role']} role challenges or performance under pressure. 10-12 words."
-        else:
-            prompt = f"Ask HR question about {session['role']} role strengths or professional development plans. 10-12 words."
-    
+    category, prompt = main_question_prompt(session['question_count'], difficulty, session['company'], session['role'],
+                                            session['resume_content'], session.get('company_data', []))
+    session['current_category'] = category
     session['messages'] = [{"role": "system", "content": prompt}]
     
-    result = groq_chat(session['messages'])
-    if 'choices' in result and len(result['choices']) > 0:
-        assistant_message = result['choices'][0]['message']['content']
-        session['messages'].append({"role": "assistant", "content": assistant_message})
-        
-        category = session['current_category'].title()
-        main_q = (session['question_count'] % 2) + 1
-        
-        return jsonify({
-            'response': assistant_message,
-            'question_info': f'{category} Question {main_q}/2'
-        })
+    # Company and role questions come from the pre-generated bank when it has an unused one
+    assistant_message = None
+    if question_bank is not None and category in BANK_CATEGORIES:
+        assistant_message = question_bank.sample('hr', session['company'], session['role'], difficulty, category,
+                                                 exclude=session.get('bank_asked', []))
+    
+    if assistant_message:
+        session['bank_asked'] = session.get('bank_asked', []) + [assistant_message]
     else:
-        return jsonify({'error': 'Failed to generate question'}), 500
-
-@app.route('/clear', methods=['POST'])
-def clear_chat():
-    session.clear()
-    return jsonify({'status': 'cleared'})
-
-if __name__ == "__main__":
-    app.run(debug=True, port=5001)
-        return jsonify({'error': 'Failed to generate question'}), 500
+        # The two company (and two role) questions share a prompt; only the first may come from the cache
+        prompt_key = hashlib.sha256(prompt.encode('utf-8')).hexdigest()[:16]
+        result = groq_client.chat(session['messages'], use_cache=prompt_key not in session.get('asked_prompts', []),
+                                  session_id=session.get('hr_session_id'), call_site='main_question')
+        if 'choices' in result and len(result['choices']) > 0 and \
+                result['choices'][0]['message']['content'] in session.get('asked_questions', []):
+            result = groq_client.chat(session['messages'], use_cache=False, temperature=1.0,
+                                      session_id=session.get('hr_session_id'), call_site='main_question')
+        if not ('choices' in result and len(result['choices']) > 0):
+            return jsonify({'error': 'Failed to generate question'}), 500
+        assistant_message = result['choices'][0]['message']['content']
+        session['asked_prompts'] = session.get('asked_prompts', []) + [prompt_key]
+    
+    session['asked_questions'] = session.get('asked_questions', []) + [assistant_message]
+    session['messages'].append({"role": "assistant", "content": assistant_message})
+    
+    category = session['current_category'].title()
+    main_q = (session['question_count'] % 2) + 1
+    
+    return jsonify({
+        'response': assistant_message,
+        'question_info': f'{category} Question {main_q}/2'
+    })
 
 @app.route('/clear', methods=['POST'])
 def clear_chat():
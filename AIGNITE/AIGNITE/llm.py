@@ -1,15 +1,20 @@
-from flask import Flask, render_template, request, jsonify, session
+from flask import Flask, render_template, request, jsonify, session, Response, stream_with_context
 from flask_cors import CORS
-import requests
 import os
 import uuid
 from werkzeug.utils import secure_filename
-import pytesseract
-from PIL import Image
-import fitz  
-from docx import Document
+from llm_client import GroqClient, LLMStreamError
+from llm_cache import cache_from_env
+from llm_scheduler import scheduler_from_env
+from llm_usage import usage_from_env
+from question_bank import BANK_CATEGORIES, QuestionBank
+from resume_cache import content_digest, resume_cache_from_env, upload_store_from_env
+from resume_parser import RESUME_TEXT_CHARS, RESUME_TEXT_KEY, resume_text
+from ocr_jobs import ocr_queue_from_env
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 import json
+import time
 
 app = Flask(__name__)
 app.secret_key = 'your-secret-key'
@@ -19,64 +24,44 @@ app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024
 # Enable CORS for frontend
 CORS(app, origins=["http://localhost:3000", "http://localhost:5173"], supports_credentials=True)
 
-if not os.path.exists('uploads'):
-    os.makedirs('uploads')
+# Pooled Groq client shared by every route; main questions are served from the response cache,
+# and calls are scheduled fairly across interviews within the provider's rate limits
+groq_client = GroqClient(cache=cache_from_env(), scheduler=scheduler_from_env(), usage=usage_from_env())
 
-def load_api_key():
-    with open('key.txt', 'r') as f:
-        return f.read().strip().replace('API: ', '')
+# Pre-generated company/role questions (see question_bank.py); None until a bank is built
+question_bank = QuestionBank.from_env()
 
-def extract_text_from_file(filepath):
-    filename = os.path.basename(filepath).lower()
-    
-    if filename.endswith('.txt'):
-        with open(filepath, 'r', encoding='utf-8') as f:
-            return f.read()
-    
-    elif filename.endswith('.pdf'):
-        doc = fitz.open(filepath)
-        text = ""
-        for page in doc:
-            text += page.get_text()
-        return text
-    
-    elif filename.endswith('.docx'):
-        doc = Document(filepath)
-        text = ""
-        for paragraph in doc.paragraphs:
-            text += paragraph.text + "\n"
-        return text
-    
-    elif filename.endswith(('.png', '.jpg', '.jpeg', '.bmp', '.tiff')):
-        image = Image.open(filepath)
-        return pytesseract.image_to_string(image)
-    
-    else:
-        return f"Unsupported file format: {filename}"
+# Text already extracted from identical uploads, keyed by content hash
+resume_cache = resume_cache_from_env()
 
-def groq_chat(messages, api_key=None):
-    if not api_key:
-        api_key = load_api_key()
-    
-    url = "https://api.groq.com/openai/v1/chat/completions"
-    headers = {
-        "Authorization": f"Bearer {api_key}",
-        "Content-Type": "application/json"
-    }
-    
-    data = {
-        "messages": messages,
-        "model": "llama-3.1-8b-instant",
-        "temperature": 0.7
+# Optional content-addressed copies of uploads; parsing itself never touches the disk
+upload_store = upload_store_from_env(app.config['UPLOAD_FOLDER'])
+
+# Image and scanned-PDF resumes are OCR'd in the background; start-interview answers 202 with a job to poll
+ocr_queue = ocr_queue_from_env()
+
+# Background workers that generate each session's upcoming main question while the candidate answers
+prefetch_executor = ThreadPoolExecutor(max_workers=int(os.environ.get('LLM_PREFETCH_WORKERS', '8')),
+                                       thread_name_prefix='question-prefetch')
+
+# Main-question prompts by difficulty and category
+DIFFICULTY_SETTINGS = {
+    "easy": {
+        "resume": "Ask ONE basic technical question about specific projects or skills mentioned in the resume. Reference actual project names or technologies. 10-12 words.",
+        "company": "Ask basic technical question about {company} technology stack or development tools. 10-12 words.",
+        "role": "Ask basic technical question about {role} tools or programming languages used. 10-12 words."
+    },
+    "medium": {
+        "resume": "Ask ONE intermediate technical question about specific skills or projects mentioned in the resume. Reference actual experience. 10-12 words.",
+        "company": "Ask intermediate technical question about {company} development practices or frameworks. 10-12 words.",
+        "role": "Ask intermediate technical question about {role} data processing or analysis methods. 10-12 words."
+    },
+    "hard": {
+        "resume": "Ask ONE advanced technical question about specific projects or technologies mentioned in the resume. Reference actual work experience. 10-12 words.",
+        "company": "Ask advanced technical question about {company} system architecture or scalability solutions. 10-12 words.",
+        "role": "Ask advanced technical question about {role} complex algorithms or system design. 10-12 words."
     }
-    
-    try:
-        response = requests.post(url, headers=headers, json=data, timeout=30)
-        return response.json()
-    except requests.exceptions.Timeout:
-        return {'error': {'message': 'Request timed out. Please try again.', 'type': 'timeout'}}
-    except requests.exceptions.ConnectionError:
-        return {'error': {'message': 'Connection failed. Please check your internet connection.', 'type': 'connection_error'}}
+}
 
 # Store active interviews in memory (like your previous backend)
 active_interviews = {}
@@ -107,23 +92,13 @@ class InterviewSession:
         }
         
         # System messages based on difficulty
-        self.difficulty_settings = {
-            "easy": {
-                "resume": "Ask ONE basic technical question about specific projects or skills mentioned in the resume. Reference actual project names or technologies. 10-12 words.",
-                "company": "Ask basic technical question about {company} technology stack or development tools. 10-12 words.",
-                "role": "Ask basic technical question about {role} tools or programming languages used. 10-12 words."
-            },
-            "medium": {
-                "resume": "Ask ONE intermediate technical question about specific skills or projects mentioned in the resume. Reference actual experience. 10-12 words.",
-                "company": "Ask intermediate technical question about {company} development practices or frameworks. 10-12 words.",
-                "role": "Ask intermediate technical question about {role} data processing or analysis methods. 10-12 words."
-            },
-            "hard": {
-                "resume": "Ask ONE advanced technical question about specific projects or technologies mentioned in the resume. Reference actual work experience. 10-12 words.",
-                "company": "Ask advanced technical question about {company} system architecture or scalability solutions. 10-12 words.",
-                "role": "Ask advanced technical question about {role} complex algorithms or system design. 10-12 words."
-            }
-        }
+        self.difficulty_settings = DIFFICULTY_SETTINGS
+        
+        # Speculatively generated next main question: (key, future), see prefetch_next_main_question
+        self.prefetched = None
+        
+        # Main-question prompts already used; repeats are generated fresh instead of served from the cache
+        self.asked_prompts = set()
         
         # Initialize conversation
         self.messages = []
@@ -132,16 +107,9 @@ class InterviewSession:
     def generate_first_question(self):
         """Generate the first question based on resume"""
         category = 'resume'
-        template = self.difficulty_settings[self.difficulty][category]
-        
-        if category == 'resume':
-            prompt = f"{template} Resume: {self.resume_content[:500]}"
-        else:
-            prompt = template.format(company=self.company, role=self.role)
-        
-        self.messages = [{"role": "system", "content": prompt}]
+        self.messages = [{"role": "system", "content": self.main_question_prompt(category)}]
         
-        result = groq_chat(self.messages)
+        result = groq_client.chat(self.messages, session_id=self.session_id, call_site='first_question')
         if 'choices' in result and len(result['choices']) > 0:
             first_question = result['choices'][0]['message']['content']
             self.messages.append({"role": "assistant", "content": first_question})
@@ -158,6 +126,8 @@ class InterviewSession:
             
             self.questions_asked += 1
             self.current_category = category
+            self.asked_prompts.add(self.messages[0]["content"])
+            self.prefetch_next_main_question()
             
             return first_question
         return None
@@ -176,8 +146,107 @@ class InterviewSession:
     
     def submit_answer(self, answer):
         """Submit answer and get next question or evaluation"""
+        kind, payload = self.plan_answer(answer)
+        return self.run_step(kind, payload)
+    
+    def stream_answer(self, answer):
+        """Like submit_answer, but yields ('token', text) as the next question streams in,
+        then ('result', response) once it has been recorded
+        
+        If the stream stops before a question is recorded (the client went away,
+        or generation failed), the answer is rolled back and can be sent again.
+        """
+        checkpoint = self.answer_checkpoint()
+        kind, payload = self.plan_answer(answer)
+        steps = self.stream_step(kind, payload)
+        recorded = False
+        try:
+            for event, value in steps:
+                recorded = event == 'result' and 'error' not in value
+                yield event, value
+        finally:
+            if not recorded:
+                self.rollback_answer(checkpoint)
+            steps.close()
+    
+    def answer_checkpoint(self):
+        """The state plan_answer changes, for rollback_answer"""
+        last = self.interview_data["questions"][-1] if self.interview_data["questions"] else {}
+        return (self.question_count, self.sub_question_count, self.current_category, list(self.messages),
+                last.get("answer"), last.get("answer_timestamp"))
+    
+    def rollback_answer(self, checkpoint):
+        """Undo plan_answer for an answer whose next question was never recorded"""
+        (self.question_count, self.sub_question_count, self.current_category, self.messages,
+         answer, answer_timestamp) = checkpoint
+        if self.interview_data["questions"]:
+            last_question = self.interview_data["questions"][-1]
+            if answer is None:
+                last_question.pop("answer", None)
+                last_question.pop("answer_timestamp", None)
+            else:
+                last_question["answer"] = answer
+                last_question["answer_timestamp"] = answer_timestamp
+    
+    def run_step(self, kind, payload):
+        """Generate the planned question in one call and record it"""
+        if kind == 'done':
+            return payload
+        
+        if kind == 'main':
+            prefetched = self.take_banked_question() or self.take_prefetched_question()
+            if prefetched is not None:
+                return self.record_question(kind, prefetched)
+        
+        result = groq_client.chat(self.messages, use_cache=self.cacheable(kind), session_id=self.session_id,
+                                  call_site=self.call_site(kind))
+        if 'choices' in result and len(result['choices']) > 0:
+            return self.record_question(kind, result['choices'][0]['message']['content'])
+        
+        return {"error": "Failed to generate question"}
+    
+    def stream_step(self, kind, payload):
+        """Stream the planned question token by token, then record it"""
+        if kind == 'done':
+            yield 'result', payload
+            return
+        
+        if kind == 'main':
+            prefetched = self.take_banked_question() or self.take_prefetched_question()
+            if prefetched is not None:
+                yield 'token', prefetched
+                yield 'result', self.record_question(kind, prefetched)
+                return
+        
+        parts = []
+        try:
+            for token in groq_client.stream_chat(self.messages, use_cache=self.cacheable(kind), session_id=self.session_id,
+                                                 call_site=self.call_site(kind)):
+                parts.append(token)
+                yield 'token', token
+        except LLMStreamError:
+            yield 'result', {"error": "Failed to generate question"}
+            return
+        
+        yield 'result', self.record_question(kind, ''.join(parts))
+    
+    def cacheable(self, kind):
+        """Follow-ups should vary with the answer, and a category's second main question reuses
+        the first one's prompt, so only a session's first use of a main-question prompt is cached"""
+        return kind != 'sub' and self.messages[0]["content"] not in self.asked_prompts
+    
+    @staticmethod
+    def call_site(kind):
+        return 'follow_up' if kind == 'sub' else 'main_question'
+    
+    def plan_answer(self, answer):
+        """Record the answer and set up the next prompt in self.messages
+        
+        Returns ('sub' | 'main', None) when a question has to be generated,
+        or ('done', response) when there is nothing to generate.
+        """
         if self.questions_asked >= self.total_questions:
-            return {"completed": True}
+            return 'done', {"completed": True}
         
         # Store the answer for current question
         if self.interview_data["questions"]:
@@ -195,95 +264,163 @@ class InterviewSession:
             prompt = f"Ask a follow-up question about: '{answer}'. 10-12 words."
             
             self.messages.append({"role": "system", "content": prompt})
-            
-            result = groq_chat(self.messages)
-            if 'choices' in result and len(result['choices']) > 0:
-                assistant_message = result['choices'][0]['message']['content']
-                self.messages.append({"role": "assistant", "content": assistant_message})
-                
-                # Store sub-question
-                sub_question_data = {
-                    "question_number": self.questions_asked,
-                    "category": self.current_category,
-                    "question_type": "sub",
-                    "question_text": assistant_message,
-                    "timestamp": datetime.now().isoformat()
-                }
-                self.interview_data["questions"].append(sub_question_data)
-                
-                return {
-                    "next_question": assistant_message,
-                    "category": self.current_category.title(),
-                    "question_info": f"{self.current_category.title()} Question {(self.question_count % 2) + 1}/2 - Sub {self.sub_question_count}/1",
-                    "completed": False
-                }
+            return 'sub', None
         else:
             # Move to next main question
-            return self.generate_next_main_question()
+            return self.plan_main_question()
+    
+    def record_question(self, kind, assistant_message):
+        """Store a generated sub or main question and build the route response"""
+        self.messages.append({"role": "assistant", "content": assistant_message})
+        
+        if kind == 'sub':
+            # Store sub-question
+            sub_question_data = {
+                "question_number": self.questions_asked,
+                "category": self.current_category,
+                "question_type": "sub",
+                "question_text": assistant_message,
+                "timestamp": datetime.now().isoformat()
+            }
+            self.interview_data["questions"].append(sub_question_data)
+            
+            return {
+                "next_question": assistant_message,
+                "category": self.current_category.title(),
+                "question_info": f"{self.current_category.title()} Question {(self.question_count % 2) + 1}/2 - Sub {self.sub_question_count}/1",
+                "completed": False
+            }
         
-        return {"error": "Failed to generate question"}
+        # Store main question
+        question_data = {
+            "question_number": self.questions_asked + 1,
+            "category": self.current_category,
+            "question_type": "main",
+            "question_text": assistant_message,
+            "timestamp": datetime.now().isoformat()
+        }
+        self.interview_data["questions"].append(question_data)
+        
+        self.questions_asked += 1
+        self.asked_prompts.add(self.messages[0]["content"])
+        self.prefetch_next_main_question()
+        
+        return {
+            "next_question": assistant_message,
+            "category": self.current_category.title(),
+            "question_info": f"{self.current_category.title()} Question {(self.question_count % 2) + 1}/2",
+            "completed": False
+        }
     
     def generate_next_main_question(self):
         """Generate the next main question"""
+        kind, payload = self.plan_main_question()
+        return self.run_step(kind, payload)
+    
+    def plan_main_question(self):
+        """Advance to the next main question and set up its prompt, or finish the interview"""
         self.question_count += 1
         self.sub_question_count = 0
         
         if self.question_count >= self.total_questions // 2:  # 2 questions per category
             # Interview complete
+            self.discard_prefetched()
             self.interview_data["status"] = "completed"
             self.interview_data["end_time"] = datetime.now().isoformat()
             
             # Generate final evaluation
             evaluation = self.get_final_evaluation()
             
-            return {
+            return 'done', {
                 "completed": True,
                 "summary": evaluation
             }
         
         # Determine next category
-        if self.question_count < 2:
-            self.current_category = 'resume'
-        elif self.question_count < 4:
-            self.current_category = 'company'
-        else:
-            self.current_category = 'role'
+        self.current_category = self.category_for(self.question_count)
         
         # Generate question based on category and difficulty
-        template = self.difficulty_settings[self.difficulty][self.current_category]
+        self.messages = [{"role": "system", "content": self.main_question_prompt(self.current_category)}]
+        return 'main', None
+    
+    def category_for(self, question_count):
+        if question_count < 2:
+            return 'resume'
+        elif question_count < 4:
+            return 'company'
+        return 'role'
+    
+    def main_question_prompt(self, category):
+        template = self.difficulty_settings[self.difficulty][category]
         
-        if self.current_category == 'resume':
-            prompt = f"{template} Resume: {self.resume_content[:500]}"
-        else:
-            prompt = template.format(company=self.company, role=self.role)
+        if category == 'resume':
+            return f"{template} Resume: {self.resume_content[:500]}"
+        return template.format(company=self.company, role=self.role)
+    
+    def prefetch_next_main_question(self):
+        """Start generating the next main question in the background
+        
+        A main question's prompt depends only on the category template, company,
+        role and resume, never on the candidate's answers, so it can be generated
+        while the current question is being answered.
+        """
+        next_count = self.question_count + 1
+        if next_count >= self.total_questions // 2:
+            self.discard_prefetched()
+            return
+        
+        category = self.category_for(next_count)
+        if self.bank_covers(category):
+            self.discard_prefetched()
+            return
+        
+        prompt = self.main_question_prompt(category)
+        key = (next_count, category, prompt)
+        if self.prefetched and self.prefetched[0] == key:
+            return
+        
+        self.discard_prefetched()
+        messages = [{"role": "system", "content": prompt}]
+        self.prefetched = (key, prefetch_executor.submit(groq_client.chat, messages, session_id=self.session_id,
+                                                              use_cache=prompt not in self.asked_prompts,
+                                                              call_site='main_question_prefetch'))
+    
+    def take_prefetched_question(self):
+        """Return the prefetched question if it was generated for the current plan, else None"""
+        prefetched, self.prefetched = self.prefetched, None
+        if prefetched is None:
+            return None
         
-        self.messages = [{"role": "system", "content": prompt}]
+        key, future = prefetched
+        if key != (self.question_count, self.current_category, self.messages[0]["content"]):
+            future.cancel()
+            return None
         
-        result = groq_chat(self.messages)
+        try:
+            result = future.result()
+        except Exception:
+            return None
         if 'choices' in result and len(result['choices']) > 0:
-            assistant_message = result['choices'][0]['message']['content']
-            self.messages.append({"role": "assistant", "content": assistant_message})
-            
-            # Store main question
-            question_data = {
-                "question_number": self.questions_asked + 1,
-                "category": self.current_category,
-                "question_type": "main",
-                "question_text": assistant_message,
-                "timestamp": datetime.now().isoformat()
-            }
-            self.interview_data["questions"].append(question_data)
-            
-            self.questions_asked += 1
-            
-            return {
-                "next_question": assistant_message,
-                "category": self.current_category.title(),
-                "question_info": f"{self.current_category.title()} Question {(self.question_count % 2) + 1}/2",
-                "completed": False
-            }
+            return result['choices'][0]['message']['content']
+        return None
+    
+    def bank_covers(self, category):
+        return (question_bank is not None and category in BANK_CATEGORIES and
+                question_bank.covers('technical', self.company, self.role, self.difficulty, category))
+    
+    def take_banked_question(self):
+        """Return a pre-generated question for the current category not yet asked in this session, else None"""
+        if not self.bank_covers(self.current_category):
+            return None
         
-        return {"error": "Failed to generate question"}
+        asked = {q["question_text"] for q in self.interview_data["questions"]}
+        return question_bank.sample('technical', self.company, self.role, self.difficulty, self.current_category,
+                                    exclude=asked)
+    
+    def discard_prefetched(self):
+        if self.prefetched:
+            self.prefetched[1].cancel()
+            self.prefetched = None
     
     def get_final_evaluation(self):
         """Generate final evaluation of the interview"""
@@ -367,40 +504,78 @@ def start_interview():
         if file.filename == '':
             return jsonify({"error": "No file selected"}), 400
         
-        # Save file
+        # Read the upload into memory; keep a copy only if the upload store is enabled
         filename = secure_filename(file.filename)
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        file.save(filepath)
-        
-        # Extract text from resume
-        resume_content = extract_text_from_file(filepath)
-        
-        # Generate session ID
-        session_id = str(uuid.uuid4())
-        
-        # Create interview session
-        interview = InterviewSession(session_id, company, role, resume_content, difficulty)
-        active_interviews[session_id] = interview
-        
-        # Get first question
-        first_question = interview.get_next_question()
+        data = file.read()
+        if upload_store:
+            upload_store.save(data, filename)
+        
+        # Extract the start of the resume, unless these exact bytes were extracted before
+        digest = content_digest(data)
+        cached = resume_cache.get(digest, filename, RESUME_TEXT_KEY) if resume_cache else None
+        if cached:
+            resume_content = cached['text']
+        else:
+            # A single pass reads the text, or stops at the first page that needs OCR
+            start = time.perf_counter()
+            resume_content = resume_text(data, filename, skip_scanned=ocr_queue is not None)
         
-        return jsonify({
-            "session_id": session_id,
-            "company": company,
-            "role": role,
-            "first_question": first_question,
-            "difficulty": difficulty,
-            "message": "Interview session started successfully",
-            "progress": {
-                "current": interview.questions_asked,
-                "total": interview.total_questions
-            }
-        })
+        if resume_content is None:
+            # OCR takes seconds; answer now and start the interview when the text is ready
+            queued_at = time.perf_counter()
+            
+            def start_when_ready(text):
+                if resume_cache:
+                    resume_cache.put(digest, filename, text, time.perf_counter() - queued_at, RESUME_TEXT_KEY)
+                return start_session(company, role, text, difficulty)
+            
+            job_id = ocr_queue.submit(data, filename, RESUME_TEXT_CHARS, on_done=start_when_ready)
+            return jsonify({
+                "job_id": job_id,
+                "status": "queued",
+                "status_url": f"/api/ocr-jobs/{job_id}",
+                "message": "Resume is being read; poll status_url until status is done"
+            }), 202
+        
+        if not cached and resume_cache:
+            resume_cache.put(digest, filename, resume_content, time.perf_counter() - start, RESUME_TEXT_KEY)
+        
+        return jsonify(start_session(company, role, resume_content, difficulty))
     
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+def start_session(company, role, resume_content, difficulty):
+    """Create an interview and its first question; returns the start-interview response body"""
+    session_id = str(uuid.uuid4())
+    interview = InterviewSession(session_id, company, role, resume_content, difficulty)
+    active_interviews[session_id] = interview
+    
+    # Get first question
+    first_question = interview.get_next_question()
+    
+    return {
+        "session_id": session_id,
+        "company": company,
+        "role": role,
+        "first_question": first_question,
+        "difficulty": difficulty,
+        "message": "Interview session started successfully",
+        "progress": {
+            "current": interview.questions_asked,
+            "total": interview.total_questions
+        }
+    }
+
+@app.route('/api/ocr-jobs/<job_id>', methods=['GET'])
+def ocr_job_status(job_id):
+    """Status of a resume OCR job; once done, result holds the start-interview response"""
+    job = ocr_queue.get(job_id) if ocr_queue else None
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    
+    return jsonify(job)
+
 @app.route('/api/get-question/<session_id>', methods=['GET'])
 def get_question(session_id):
     """Get current question for the session"""
@@ -439,6 +614,37 @@ def submit_answer(session_id):
     
     return jsonify(result)
 
+@app.route('/api/submit-answer/<session_id>/stream', methods=['POST'])
+def submit_answer_stream(session_id):
+    """Submit answer and stream the next question back as server-sent events
+    
+    Emits one `token` event per chunk of the question, then a `done` event
+    carrying the same JSON that /api/submit-answer returns.
+    """
+    if session_id not in active_interviews:
+        return jsonify({"error": "Session not found"}), 404
+    
+    data = request.json
+    answer = data.get('answer', '')
+    
+    if not answer:
+        return jsonify({"error": "Missing answer"}), 400
+    
+    interview = active_interviews[session_id]
+    
+    def events():
+        for kind, value in interview.stream_answer(answer):
+            if kind == 'token':
+                yield sse_event('token', {"text": value})
+            else:
+                yield sse_event('done', value)
+    
+    return Response(stream_with_context(events()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+def sse_event(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
 @app.route('/api/skip-question/<session_id>', methods=['POST'])
 def skip_question(session_id):
     """Skip current question"""
@@ -477,7 +683,8 @@ def session_status(session_id):
         "questions_asked": interview.questions_asked,
         "total_questions": interview.total_questions,
         "current_category": interview.current_category,
-        "status": interview.interview_data["status"]
+        "status": interview.interview_data["status"],
+        "llm_usage": groq_client.usage.session(session_id)
     })
 
 @app.route('/api/health', methods=['GET'])
@@ -486,7 +693,22 @@ def health():
     return jsonify({
         "status": "healthy", 
         "timestamp": datetime.now().isoformat(),
-        "active_sessions": len(active_interviews)
+        "active_sessions": len(active_interviews),
+        "llm_cache": groq_client.cache.stats() if groq_client.cache else None,
+        "llm_scheduler": groq_client.scheduler.stats()
+    })
+
+@app.route('/api/metrics', methods=['GET'])
+def metrics():
+    """LLM token, latency and cost totals by call site, plus cache, scheduler and resume cache stats"""
+    return jsonify({
+        "timestamp": datetime.now().isoformat(),
+        "llm_usage": groq_client.usage.snapshot(),
+        "llm_cache": groq_client.cache.stats() if groq_client.cache else None,
+        "llm_scheduler": groq_client.scheduler.stats(),
+        "question_bank": question_bank.stats() if question_bank else None,
+        "resume_cache": resume_cache.stats() if resume_cache else None,
+        "ocr_queue": ocr_queue.stats() if ocr_queue else None
     })
 
 # Keep your original routes for backward compatibility
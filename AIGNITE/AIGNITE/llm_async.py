@@ -0,0 +1,414 @@
+"""asyncio version of the interview API in llm.py
+
+Same routes and JSON as llm.py, but served by Quart: LLM calls await a shared
+httpx pool instead of holding a worker thread, so one process can keep
+hundreds of interviews waiting on the provider at once. Resume text
+extraction runs in a process pool so it does not stall the event loop.
+
+    hypercorn llm_async:app --bind 0.0.0.0:5000
+"""
+from quart import Quart, render_template, request, jsonify, session, Response
+from quart_cors import cors
+import asyncio
+import time
+import uuid
+from werkzeug.utils import secure_filename
+from llm import InterviewSession, ocr_queue, question_bank, resume_cache, sse_event, upload_store
+from llm_client import LLMStreamError
+from llm_client_async import AsyncGroqClient
+from llm_cache import cache_from_env
+from llm_scheduler import AsyncLLMScheduler, scheduler_from_env
+from llm_usage import usage_from_env
+from resume_cache import content_digest
+from resume_parser import RESUME_TEXT_CHARS, RESUME_TEXT_KEY, extraction_pool_from_env, resume_text
+from datetime import datetime
+
+app = Quart(__name__)
+app.secret_key = 'your-secret-key'
+app.config['UPLOAD_FOLDER'] = 'uploads'
+app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024
+
+# Enable CORS for frontend
+app = cors(app, allow_origin=["http://localhost:3000", "http://localhost:5173"], allow_credentials=True)
+
+groq_client = AsyncGroqClient(cache=cache_from_env(), scheduler=scheduler_from_env(AsyncLLMScheduler),
+                              usage=usage_from_env())
+
+# PDF parsing is CPU bound; keep it off the event loop
+extraction_executor = extraction_pool_from_env()
+
+active_interviews = {}
+
+class AsyncInterviewSession(InterviewSession):
+    """InterviewSession whose LLM calls are awaited
+
+    Reuses the synchronous session's plan/record steps, so questions, scoring
+    and stored interview_data are identical; only the calls to the provider
+    (and the speculative next-question prefetch) go through the async client.
+    """
+
+    def generate_first_question(self):
+        # Called from InterviewSession.__init__; the question itself is generated by start()
+        self.messages = [{"role": "system", "content": self.main_question_prompt('resume')}]
+
+    async def start(self):
+        """Generate the first question"""
+        result = await groq_client.chat(self.messages, session_id=self.session_id, call_site='first_question')
+        if 'choices' in result and len(result['choices']) > 0:
+            first_question = result['choices'][0]['message']['content']
+            self.record_question('main', first_question)
+            return first_question
+        return None
+
+    async def submit_answer(self, answer):
+        kind, payload = self.plan_answer(answer)
+        return await self.run_step(kind, payload)
+
+    async def stream_answer(self, answer):
+        checkpoint = self.answer_checkpoint()
+        kind, payload = self.plan_answer(answer)
+        steps = self.stream_step(kind, payload)
+        recorded = False
+        try:
+            async for event, value in steps:
+                recorded = event == 'result' and 'error' not in value
+                yield event, value
+        finally:
+            if not recorded:
+                self.rollback_answer(checkpoint)
+            await steps.aclose()
+
+    async def skip_question(self):
+        kind, payload = self.plan_main_question()
+        return await self.run_step(kind, payload)
+
+    async def run_step(self, kind, payload):
+        if kind == 'done':
+            return payload
+
+        if kind == 'main':
+            prefetched = self.take_banked_question() or await self.take_prefetched_question()
+            if prefetched is not None:
+                return self.record_question(kind, prefetched)
+
+        result = await groq_client.chat(self.messages, use_cache=self.cacheable(kind), session_id=self.session_id,
+                                        call_site=self.call_site(kind))
+        if 'choices' in result and len(result['choices']) > 0:
+            return self.record_question(kind, result['choices'][0]['message']['content'])
+
+        return {"error": "Failed to generate question"}
+
+    async def stream_step(self, kind, payload):
+        if kind == 'done':
+            yield 'result', payload
+            return
+
+        if kind == 'main':
+            prefetched = self.take_banked_question() or await self.take_prefetched_question()
+            if prefetched is not None:
+                yield 'token', prefetched
+                yield 'result', self.record_question(kind, prefetched)
+                return
+
+        parts = []
+        try:
+            async for token in groq_client.stream_chat(self.messages, use_cache=self.cacheable(kind),
+                                                       session_id=self.session_id, call_site=self.call_site(kind)):
+                parts.append(token)
+                yield 'token', token
+        except LLMStreamError:
+            yield 'result', {"error": "Failed to generate question"}
+            return
+
+        yield 'result', self.record_question(kind, ''.join(parts))
+
+    def prefetch_next_main_question(self):
+        next_count = self.question_count + 1
+        if next_count >= self.total_questions // 2:
+            self.discard_prefetched()
+            return
+
+        category = self.category_for(next_count)
+        if self.bank_covers(category):
+            self.discard_prefetched()
+            return
+
+        prompt = self.main_question_prompt(category)
+        key = (next_count, category, prompt)
+        if self.prefetched and self.prefetched[0] == key:
+            return
+
+        self.discard_prefetched()
+        messages = [{"role": "system", "content": prompt}]
+        task = asyncio.get_running_loop().create_task(
+            groq_client.chat(messages, session_id=self.session_id, use_cache=prompt not in self.asked_prompts,
+                             call_site='main_question_prefetch'))
+        self.prefetched = (key, task)
+
+    async def take_prefetched_question(self):
+        prefetched, self.prefetched = self.prefetched, None
+        if prefetched is None:
+            return None
+
+        key, task = prefetched
+        if key != (self.question_count, self.current_category, self.messages[0]["content"]):
+            task.cancel()
+            return None
+
+        try:
+            result = await task
+        except Exception:
+            return None
+        if 'choices' in result and len(result['choices']) > 0:
+            return result['choices'][0]['message']['content']
+        return None
+
+# API Routes, mirroring llm.py
+@app.route('/api/start-interview', methods=['POST'])
+async def start_interview():
+    """Start a new interview session with resume upload"""
+    try:
+        files = await request.files
+        form = await request.form
+
+        if 'resume' not in files:
+            return jsonify({"error": "No resume file provided"}), 400
+
+        file = files['resume']
+        company = form.get('company', 'TCS')
+        role = form.get('role', 'Data Analyst')
+        difficulty = form.get('difficulty', 'medium')
+
+        if file.filename == '':
+            return jsonify({"error": "No file selected"}), 400
+
+        # Read the upload into memory; keep a copy only if the upload store is enabled
+        filename = secure_filename(file.filename)
+        data = file.read()
+        if upload_store:
+            await asyncio.to_thread(upload_store.save, data, filename)
+
+        # Extract the start of the resume, unless these exact bytes were extracted before
+        cached = None
+        digest = await asyncio.to_thread(content_digest, data)
+        if resume_cache:
+            cached = await asyncio.to_thread(resume_cache.get, digest, filename, RESUME_TEXT_KEY)
+
+        loop = asyncio.get_running_loop()
+        if cached:
+            resume_content = cached['text']
+        else:
+            # A single pass reads the text, or stops at the first page that needs OCR
+            start = time.perf_counter()
+            resume_content = await loop.run_in_executor(extraction_executor, resume_text, data, filename,
+                                                        ocr_queue is not None)
+
+        if resume_content is None:
+            # OCR takes seconds; answer now and start the interview when the text is ready
+            queued_at = time.perf_counter()
+
+            def start_when_ready(text):
+                if resume_cache:
+                    resume_cache.put(digest, filename, text, time.perf_counter() - queued_at, RESUME_TEXT_KEY)
+                return asyncio.run_coroutine_threadsafe(
+                    start_session(company, role, text, difficulty), loop).result()
+
+            job_id = ocr_queue.submit(data, filename, RESUME_TEXT_CHARS, on_done=start_when_ready)
+            return jsonify({
+                "job_id": job_id,
+                "status": "queued",
+                "status_url": f"/api/ocr-jobs/{job_id}",
+                "message": "Resume is being read; poll status_url until status is done"
+            }), 202
+
+        if not cached and resume_cache:
+            await asyncio.to_thread(resume_cache.put, digest, filename, resume_content,
+                                    time.perf_counter() - start, RESUME_TEXT_KEY)
+
+        return jsonify(await start_session(company, role, resume_content, difficulty))
+
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+async def start_session(company, role, resume_content, difficulty):
+    """Create an interview and its first question; returns the start-interview response body"""
+    session_id = str(uuid.uuid4())
+    interview = AsyncInterviewSession(session_id, company, role, resume_content, difficulty)
+    await interview.start()
+    active_interviews[session_id] = interview
+
+    # Get first question
+    first_question = interview.get_next_question()
+
+    return {
+        "session_id": session_id,
+        "company": company,
+        "role": role,
+        "first_question": first_question,
+        "difficulty": difficulty,
+        "message": "Interview session started successfully",
+        "progress": {
+            "current": interview.questions_asked,
+            "total": interview.total_questions
+        }
+    }
+
+@app.route('/api/ocr-jobs/<job_id>', methods=['GET'])
+async def ocr_job_status(job_id):
+    """Status of a resume OCR job; once done, result holds the start-interview response"""
+    job = ocr_queue.get(job_id) if ocr_queue else None
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+
+    return jsonify(job)
+
+@app.route('/api/get-question/<session_id>', methods=['GET'])
+async def get_question(session_id):
+    """Get current question for the session"""
+    if session_id not in active_interviews:
+        return jsonify({"error": "Session not found"}), 404
+
+    interview = active_interviews[session_id]
+
+    if interview.questions_asked >= interview.total_questions:
+        return jsonify({"completed": True})
+
+    question_info = interview.get_next_question()
+
+    return jsonify({
+        "question": question_info,
+        "progress": {
+            "current": interview.questions_asked,
+            "total": interview.total_questions
+        }
+    })
+
+@app.route('/api/submit-answer/<session_id>', methods=['POST'])
+async def submit_answer(session_id):
+    """Submit answer for current question"""
+    if session_id not in active_interviews:
+        return jsonify({"error": "Session not found"}), 404
+
+    data = await request.get_json()
+    answer = data.get('answer', '')
+
+    if not answer:
+        return jsonify({"error": "Missing answer"}), 400
+
+    interview = active_interviews[session_id]
+    result = await interview.submit_answer(answer)
+
+    return jsonify(result)
+
+@app.route('/api/submit-answer/<session_id>/stream', methods=['POST'])
+async def submit_answer_stream(session_id):
+    """Submit answer and stream the next question back as server-sent events"""
+    if session_id not in active_interviews:
+        return jsonify({"error": "Session not found"}), 404
+
+    data = await request.get_json()
+    answer = data.get('answer', '')
+
+    if not answer:
+        return jsonify({"error": "Missing answer"}), 400
+
+    interview = active_interviews[session_id]
+
+    async def events():
+        async for kind, value in interview.stream_answer(answer):
+            if kind == 'token':
+                yield sse_event('token', {"text": value})
+            else:
+                yield sse_event('done', value)
+
+    return Response(events(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/api/skip-question/<session_id>', methods=['POST'])
+async def skip_question(session_id):
+    """Skip current question"""
+    if session_id not in active_interviews:
+        return jsonify({"error": "Session not found"}), 404
+
+    interview = active_interviews[session_id]
+    result = await interview.skip_question()
+
+    return jsonify(result)
+
+@app.route('/api/get-summary/<session_id>', methods=['GET'])
+async def get_summary(session_id):
+    """Get interview summary"""
+    if session_id not in active_interviews:
+        return jsonify({"error": "Session not found"}), 404
+
+    interview = active_interviews[session_id]
+    summary = interview.get_final_evaluation()
+
+    return jsonify(summary)
+
+@app.route('/api/session-status/<session_id>', methods=['GET'])
+async def session_status(session_id):
+    """Check session status"""
+    if session_id not in active_interviews:
+        return jsonify({"error": "Session not found"}), 404
+
+    interview = active_interviews[session_id]
+
+    return jsonify({
+        "session_id": session_id,
+        "company": interview.company,
+        "role": interview.role,
+        "difficulty": interview.difficulty,
+        "questions_asked": interview.questions_asked,
+        "total_questions": interview.total_questions,
+        "current_category": interview.current_category,
+        "status": interview.interview_data["status"],
+        "llm_usage": groq_client.usage.session(session_id)
+    })
+
+@app.route('/api/health', methods=['GET'])
+async def health():
+    """Health check endpoint"""
+    return jsonify({
+        "status": "healthy",
+        "timestamp": datetime.now().isoformat(),
+        "active_sessions": len(active_interviews),
+        "llm_cache": groq_client.cache.stats() if groq_client.cache else None,
+        "llm_scheduler": groq_client.scheduler.stats()
+    })
+
+@app.route('/api/metrics', methods=['GET'])
+async def metrics():
+    """LLM token, latency and cost totals by call site, plus cache, scheduler and resume cache stats"""
+    return jsonify({
+        "timestamp": datetime.now().isoformat(),
+        "llm_usage": groq_client.usage.snapshot(),
+        "llm_cache": groq_client.cache.stats() if groq_client.cache else None,
+        "llm_scheduler": groq_client.scheduler.stats(),
+        "question_bank": question_bank.stats() if question_bank else None,
+        "resume_cache": resume_cache.stats() if resume_cache else None,
+        "ocr_queue": ocr_queue.stats() if ocr_queue else None
+    })
+
+@app.route('/')
+async def index():
+    return await render_template('chat.html')
+
+@app.route('/set_difficulty', methods=['POST'])
+async def set_difficulty():
+    difficulty = (await request.get_json()).get('difficulty')
+    session['difficulty'] = difficulty
+    return jsonify({'status': 'difficulty set', 'level': difficulty})
+
+@app.route('/clear', methods=['POST'])
+async def clear_chat():
+    session.clear()
+    return jsonify({'status': 'cleared'})
+
+@app.after_serving
+async def close_pools():
+    await groq_client.aclose()
+    extraction_executor.shutdown(wait=False)
+
+if __name__ == "__main__":
+    app.run(debug=True, port=5000)
@@ -0,0 +1,136 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+class ResponseCache:
+    """Content-addressed cache of chat completions
+
+    Entries are keyed by a SHA-256 of the request (model, messages and sampling
+    params) and expire `ttl` seconds after they were stored. The in-memory tier
+    holds at most `max_entries` responses and evicts the least recently used.
+    With `db_path` set, responses are also written to SQLite so they survive
+    restarts and are shared by every process pointing at the same file.
+    """
+
+    def __init__(self, max_entries=512, ttl=24 * 3600, db_path=None, max_db_entries=10000):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.db_path = db_path
+        self.max_db_entries = max_db_entries
+
+        self._entries = OrderedDict()  # key -> (stored_at, payload json)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if db_path:
+            with self._db() as db:
+                db.execute(
+                    "CREATE TABLE IF NOT EXISTS responses ("
+                    "key TEXT PRIMARY KEY, stored_at REAL NOT NULL, payload TEXT NOT NULL)"
+                )
+                db.execute("CREATE INDEX IF NOT EXISTS responses_stored_at ON responses (stored_at)")
+
+    @staticmethod
+    def key(request):
+        """Hash a chat-completion request body into a cache key"""
+        canonical = json.dumps(request, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        """Return the cached response for key, or None if missing or expired"""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, payload = entry
+                if now - stored_at <= self.ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return json.loads(payload)
+                del self._entries[key]
+                self.evictions += 1
+
+        if self.db_path:
+            row = self._db().execute(
+                "SELECT stored_at, payload FROM responses WHERE key = ? AND stored_at >= ?",
+                (key, now - self.ttl)
+            ).fetchone()
+            if row:
+                with self._lock:
+                    self._remember(key, row[0], row[1])
+                    self.hits += 1
+                    self.disk_hits += 1
+                return json.loads(row[1])
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key, response):
+        now = time.time()
+        payload = json.dumps(response)
+        with self._lock:
+            self._remember(key, now, payload)
+
+        if self.db_path:
+            with self._db() as db:
+                db.execute(
+                    "INSERT OR REPLACE INTO responses (key, stored_at, payload) VALUES (?, ?, ?)",
+                    (key, now, payload)
+                )
+                # Drop expired rows, then the oldest ones beyond the size cap
+                db.execute("DELETE FROM responses WHERE stored_at < ?", (now - self.ttl,))
+                db.execute(
+                    "DELETE FROM responses WHERE key IN ("
+                    "SELECT key FROM responses ORDER BY stored_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_db_entries,)
+                )
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+    def _remember(self, key, stored_at, payload):
+        self._entries[key] = (stored_at, payload)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _db(self):
+        # sqlite3 connections cannot be shared across threads, so keep one per thread
+        db = getattr(self._local, 'db', None)
+        if db is None:
+            db = sqlite3.connect(self.db_path, timeout=5)
+            db.execute("PRAGMA journal_mode=WAL")
+            self._local.db = db
+        return db
+
+
+def cache_from_env():
+    """Build the ResponseCache configured by LLM_CACHE_* environment variables, or None if disabled"""
+    if os.environ.get('LLM_CACHE', '1').lower() in ('0', 'false', 'no', 'off'):
+        return None
+    return ResponseCache(
+        max_entries=int(os.environ.get('LLM_CACHE_SIZE', '512')),
+        ttl=float(os.environ.get('LLM_CACHE_TTL', str(24 * 3600))),
+        db_path=os.environ.get('LLM_CACHE_DB') or None
+    )
@@ -0,0 +1,227 @@
+import json
+import os
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from llm_scheduler import LLMUnavailable, estimate_tokens
+
+GROQ_API_URL = "https://api.groq.com/openai/v1/chat/completions"
+DEFAULT_MODEL = "llama-3.1-8b-instant"
+
+class LLMStreamError(Exception):
+    """Raised by GroqClient.stream_chat; `error` has the same shape as chat()'s error dicts"""
+
+    def __init__(self, error):
+        super().__init__(error.get('message', 'LLM request failed'))
+        self.error = error
+
+class GroqClient:
+    """Groq chat-completions client shared by the interview apps
+
+    Keeps a pool of keep-alive connections so interview turns reuse TCP/TLS
+    sessions, and caches the API key, re-reading the key file only when its
+    modification time changes. With a `cache` (see llm_cache.ResponseCache),
+    identical requests are answered from it unless the call passes use_cache=False.
+    With a `scheduler` (see llm_scheduler.LLMScheduler), calls are admitted
+    against the provider's rate limits, fairly across the `session_id` they
+    pass, and retried on 429s, 5xx and network errors. With a `usage` tracker
+    (see llm_usage.UsageTracker), each call's tokens and wall time are recorded
+    against its session_id and call_site.
+
+    The endpoint and key can be overridden with the GROQ_API_URL and
+    GROQ_API_KEY environment variables, e.g. to point at a local stand-in
+    server (see benchmarks/mock_llm_server.py).
+    """
+
+    def __init__(self, key_path='key.txt', model=DEFAULT_MODEL, temperature=0.7, max_tokens=None,
+                 timeout=30, pool_size=32, cache=None, scheduler=None, api_url=None, usage=None):
+        self.key_path = key_path
+        self.api_url = api_url or os.environ.get('GROQ_API_URL') or GROQ_API_URL
+        self.model = model
+        self.temperature = temperature
+        self.max_tokens = max_tokens
+        self.timeout = timeout
+        self.cache = cache
+        self.scheduler = scheduler
+        self.usage = usage
+
+        self.http = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+        self.http.mount('https://', adapter)
+        self.http.mount('http://', adapter)
+
+        self._key = None
+        self._key_mtime = None
+        self._key_lock = threading.Lock()
+
+    def api_key(self):
+        """Return the API key from key_path, reloading it if the file changed"""
+        if os.environ.get('GROQ_API_KEY'):
+            return os.environ['GROQ_API_KEY']
+        try:
+            mtime = os.stat(self.key_path).st_mtime_ns
+        except OSError:
+            return None
+
+        with self._key_lock:
+            if mtime != self._key_mtime:
+                with open(self.key_path, 'r') as f:
+                    self._key = f.read().strip().replace('API: ', '')
+                self._key_mtime = mtime
+            return self._key
+
+    def build_request(self, messages, model=None, temperature=None, max_tokens=None):
+        data = {
+            "messages": messages,
+            "model": model or self.model,
+            "temperature": self.temperature if temperature is None else temperature
+        }
+        max_tokens = max_tokens or self.max_tokens
+        if max_tokens:
+            data["max_tokens"] = max_tokens
+        return data
+
+    def _headers(self, api_key):
+        return {
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json"
+        }
+
+    def _track(self, session_id, call_site, started, usage, cached, error):
+        if self.usage is not None:
+            self.usage.record(session_id, call_site, usage, time.perf_counter() - started, cached=cached, error=error)
+
+    def _post(self, data, headers, session_id, stream=False):
+        def send():
+            return self.http.post(self.api_url, headers=headers, json=data, timeout=self.timeout, stream=stream)
+
+        if self.scheduler is None:
+            return send()
+        return self.scheduler.run(session_id, send, tokens=estimate_tokens(data))
+
+    def chat(self, messages, model=None, temperature=None, max_tokens=None, api_key=None, use_cache=True,
+             session_id=None, call_site=None):
+        """Send a chat completion; returns the provider's JSON, or {'error': {...}} on failure"""
+        started = time.perf_counter()
+        call = {'cached': False}
+        result = self._chat(messages, model, temperature, max_tokens, api_key, use_cache, session_id, call)
+        self._track(session_id, call_site, started, result.get('usage'), call['cached'], 'error' in result)
+        return result
+
+    def _chat(self, messages, model, temperature, max_tokens, api_key, use_cache, session_id, call):
+        data = self.build_request(messages, model, temperature, max_tokens)
+
+        cache_key = None
+        if self.cache is not None and use_cache:
+            cache_key = self.cache.key(data)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                call['cached'] = True
+                return cached
+
+        api_key = api_key or self.api_key()
+        if not api_key:
+            return {'error': {'message': 'API key not found', 'type': 'api_key_error'}}
+
+        headers = self._headers(api_key)
+
+        try:
+            response = self._post(data, headers, session_id)
+            if response.headers.get('content-type', '').startswith('application/json'):
+                result = response.json()
+                if cache_key and result.get('choices'):
+                    self.cache.put(cache_key, result)
+                return result
+            else:
+                return {'error': {'message': 'Invalid response format', 'type': 'format_error'}}
+        except LLMUnavailable as e:
+            return {'error': {'message': str(e), 'type': e.error_type, 'retry_after': e.retry_after}}
+        except requests.exceptions.Timeout:
+            return {'error': {'message': 'Request timed out. Please try again.', 'type': 'timeout'}}
+        except requests.exceptions.ConnectionError:
+            return {'error': {'message': 'Connection failed. Please check your internet connection.', 'type': 'connection_error'}}
+        except Exception as e:
+            return {'error': {'message': str(e), 'type': 'unknown_error'}}
+
+    def stream_chat(self, messages, model=None, temperature=None, max_tokens=None, api_key=None, use_cache=True,
+                    session_id=None, call_site=None):
+        """Stream a chat completion, yielding content deltas as they arrive
+
+        A cached response (shared with chat()) is yielded as a single delta.
+        Raises LLMStreamError if the request fails before or during the stream.
+        """
+        started = time.perf_counter()
+        call = {'cached': False, 'usage': None, 'error': False}
+        try:
+            yield from self._stream_chat(messages, model, temperature, max_tokens, api_key, use_cache,
+                                         session_id, call)
+        except LLMStreamError:
+            call['error'] = True
+            raise
+        finally:
+            self._track(session_id, call_site, started, call['usage'], call['cached'], call['error'])
+
+    def _stream_chat(self, messages, model, temperature, max_tokens, api_key, use_cache, session_id, call):
+        data = self.build_request(messages, model, temperature, max_tokens)
+
+        cache_key = None
+        if self.cache is not None and use_cache:
+            cache_key = self.cache.key(data)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                call['cached'] = True
+                yield cached['choices'][0]['message']['content']
+                return
+
+        api_key = api_key or self.api_key()
+        if not api_key:
+            raise LLMStreamError({'message': 'API key not found', 'type': 'api_key_error'})
+
+        data["stream"] = True
+        parts = []
+
+        try:
+            with self._post(data, self._headers(api_key), session_id, stream=True) as response:
+                if response.status_code != 200:
+                    try:
+                        error = response.json().get('error', {})
+                    except ValueError:
+                        error = {}
+                    raise LLMStreamError({
+                        'message': error.get('message', f'HTTP {response.status_code}'),
+                        'type': error.get('type', 'http_error')
+                    })
+
+                # Server-sent events: one "data: {chunk}" line per delta, then "data: [DONE]"
+                for line in response.iter_lines(decode_unicode=True):
+                    if not line or not line.startswith('data:'):
+                        continue
+                    payload = line[len('data:'):].strip()
+                    if payload == '[DONE]':
+                        break
+                    chunk = json.loads(payload)
+                    if chunk.get('error'):
+                        raise LLMStreamError(chunk['error'])
+                    # Groq reports usage on the last chunk under x_groq; OpenAI-style servers at the top level
+                    usage = chunk.get('usage') or chunk.get('x_groq', {}).get('usage')
+                    if usage:
+                        call['usage'] = usage
+                    for choice in chunk.get('choices', []):
+                        content = choice.get('delta', {}).get('content')
+                        if content:
+                            parts.append(content)
+                            yield content
+        except LLMUnavailable as e:
+            raise LLMStreamError({'message': str(e), 'type': e.error_type, 'retry_after': e.retry_after})
+        except requests.exceptions.Timeout:
+            raise LLMStreamError({'message': 'Request timed out. Please try again.', 'type': 'timeout'})
+        except requests.exceptions.ConnectionError:
+            raise LLMStreamError({'message': 'Connection failed. Please check your internet connection.', 'type': 'connection_error'})
+
+        if cache_key and parts:
+            # Store it in chat()'s shape so either call can serve the other's hits
+            self.cache.put(cache_key, {
+                'model': data['model'],
+                'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': ''.join(parts)}}]
+            })
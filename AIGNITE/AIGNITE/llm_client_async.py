@@ -0,0 +1,162 @@
+import json
+import time
+import httpx
+from llm_client import GroqClient, LLMStreamError
+from llm_scheduler import LLMUnavailable, estimate_tokens
+
+
+class AsyncGroqClient(GroqClient):
+    """asyncio version of GroqClient for the async interview API
+
+    Same request building, API key handling, caching and error dicts as
+    GroqClient, but chat() and stream_chat() await an httpx connection pool
+    instead of blocking a thread. Pass an AsyncLLMScheduler as `scheduler`.
+    """
+
+    def __init__(self, key_path='key.txt', pool_size=256, **kwargs):
+        super().__init__(key_path=key_path, pool_size=pool_size, **kwargs)
+        self.http = httpx.AsyncClient(
+            timeout=self.timeout,
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size)
+        )
+
+    async def _post(self, data, headers, session_id, stream=False):
+        async def send():
+            request = self.http.build_request('POST', self.api_url, headers=headers, json=data)
+            return await self.http.send(request, stream=stream)
+
+        if self.scheduler is None:
+            return await send()
+        return await self.scheduler.run(session_id, send, tokens=estimate_tokens(data))
+
+    async def chat(self, messages, model=None, temperature=None, max_tokens=None, api_key=None, use_cache=True,
+                   session_id=None, call_site=None):
+        """Send a chat completion; returns the provider's JSON, or {'error': {...}} on failure"""
+        started = time.perf_counter()
+        call = {'cached': False}
+        result = await self._chat(messages, model, temperature, max_tokens, api_key, use_cache, session_id, call)
+        self._track(session_id, call_site, started, result.get('usage'), call['cached'], 'error' in result)
+        return result
+
+    async def _chat(self, messages, model, temperature, max_tokens, api_key, use_cache, session_id, call):
+        data = self.build_request(messages, model, temperature, max_tokens)
+
+        cache_key = None
+        if self.cache is not None and use_cache:
+            cache_key = self.cache.key(data)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                call['cached'] = True
+                return cached
+
+        api_key = api_key or self.api_key()
+        if not api_key:
+            return {'error': {'message': 'API key not found', 'type': 'api_key_error'}}
+
+        try:
+            response = await self._post(data, self._headers(api_key), session_id)
+            if response.headers.get('content-type', '').startswith('application/json'):
+                result = response.json()
+                if cache_key and result.get('choices'):
+                    self.cache.put(cache_key, result)
+                return result
+            else:
+                return {'error': {'message': 'Invalid response format', 'type': 'format_error'}}
+        except LLMUnavailable as e:
+            return {'error': {'message': str(e), 'type': e.error_type, 'retry_after': e.retry_after}}
+        except httpx.TimeoutException:
+            return {'error': {'message': 'Request timed out. Please try again.', 'type': 'timeout'}}
+        except httpx.TransportError:
+            return {'error': {'message': 'Connection failed. Please check your internet connection.', 'type': 'connection_error'}}
+        except Exception as e:
+            return {'error': {'message': str(e), 'type': 'unknown_error'}}
+
+    async def stream_chat(self, messages, model=None, temperature=None, max_tokens=None, api_key=None, use_cache=True,
+                          session_id=None, call_site=None):
+        """Stream a chat completion, yielding content deltas as they arrive
+
+        A cached response (shared with chat()) is yielded as a single delta.
+        Raises LLMStreamError if the request fails before or during the stream.
+        """
+        started = time.perf_counter()
+        call = {'cached': False, 'usage': None, 'error': False}
+        try:
+            async for content in self._stream_chat(messages, model, temperature, max_tokens, api_key, use_cache,
+                                                   session_id, call):
+                yield content
+        except LLMStreamError:
+            call['error'] = True
+            raise
+        finally:
+            self._track(session_id, call_site, started, call['usage'], call['cached'], call['error'])
+
+    async def _stream_chat(self, messages, model, temperature, max_tokens, api_key, use_cache, session_id, call):
+        data = self.build_request(messages, model, temperature, max_tokens)
+
+        cache_key = None
+        if self.cache is not None and use_cache:
+            cache_key = self.cache.key(data)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                call['cached'] = True
+                yield cached['choices'][0]['message']['content']
+                return
+
+        api_key = api_key or self.api_key()
+        if not api_key:
+            raise LLMStreamError({'message': 'API key not found', 'type': 'api_key_error'})
+
+        data["stream"] = True
+        parts = []
+
+        try:
+            response = await self._post(data, self._headers(api_key), session_id, stream=True)
+            try:
+                if response.status_code != 200:
+                    await response.aread()
+                    try:
+                        error = response.json().get('error', {})
+                    except ValueError:
+                        error = {}
+                    raise LLMStreamError({
+                        'message': error.get('message', f'HTTP {response.status_code}'),
+                        'type': error.get('type', 'http_error')
+                    })
+
+                # Server-sent events: one "data: {chunk}" line per delta, then "data: [DONE]"
+                async for line in response.aiter_lines():
+                    if not line or not line.startswith('data:'):
+                        continue
+                    payload = line[len('data:'):].strip()
+                    if payload == '[DONE]':
+                        break
+                    chunk = json.loads(payload)
+                    if chunk.get('error'):
+                        raise LLMStreamError(chunk['error'])
+                    # Groq reports usage on the last chunk under x_groq; OpenAI-style servers at the top level
+                    usage = chunk.get('usage') or chunk.get('x_groq', {}).get('usage')
+                    if usage:
+                        call['usage'] = usage
+                    for choice in chunk.get('choices', []):
+                        content = choice.get('delta', {}).get('content')
+                        if content:
+                            parts.append(content)
+                            yield content
+            finally:
+                await response.aclose()
+        except LLMUnavailable as e:
+            raise LLMStreamError({'message': str(e), 'type': e.error_type, 'retry_after': e.retry_after})
+        except httpx.TimeoutException:
+            raise LLMStreamError({'message': 'Request timed out. Please try again.', 'type': 'timeout'})
+        except httpx.TransportError:
+            raise LLMStreamError({'message': 'Connection failed. Please check your internet connection.', 'type': 'connection_error'})
+
+        if cache_key and parts:
+            # Store it in chat()'s shape so either call can serve the other's hits
+            self.cache.put(cache_key, {
+                'model': data['model'],
+                'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': ''.join(parts)}}]
+            })
+
+    async def aclose(self):
+        await self.http.aclose()
@@ -1,11 +1,11 @@
 from flask import Flask, render_template, request, jsonify, session
-import requests
 import os
 from werkzeug.utils import secure_filename
 import pytesseract
 from PIL import Image
 import fitz  
 from docx import Document
+from llm_client import GroqClient
 
 app = Flask(__name__)
 app.secret_key = 'your-secret-key'
@@ -15,9 +15,8 @@ app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024
 if not os.path.exists('uploads'):
     os.makedirs('uploads')
 
-def load_api_key():
-    with open('key.txt', 'r') as f:
-        return f.read().strip().replace('API: ', '')
+# Pooled Groq client shared by every route
+groq_client = GroqClient()
 
 def extract_text_from_file(filepath):
     filename = os.path.basename(filepath).lower()
@@ -47,30 +46,6 @@ def extract_text_from_file(filepath):
     else:
         return f"Unsupported file format: {filename}"
 
-def groq_chat(messages, api_key=None):
-    if not api_key:
-        api_key = load_api_key()
-    
-    url = "https://api.groq.com/openai/v1/chat/completions"
-    headers = {
-        "Authorization": f"Bearer {api_key}",
-        "Content-Type": "application/json"
-    }
-    
-    data = {
-        "messages": messages,
-        "model": "llama-3.1-8b-instant",
-        "temperature": 0.7
-    }
-    
-    try:
-        response = requests.post(url, headers=headers, json=data, timeout=30)
-        return response.json()
-    except requests.exceptions.Timeout:
-        return {'error': {'message': 'Request timed out. Please try again.', 'type': 'timeout'}}
-    except requests.exceptions.ConnectionError:
-        return {'error': {'message': 'Connection failed. Please check your internet connection.', 'type': 'connection_error'}}
-
 @app.route('/')
 def index():
     return render_template('chat.html')
@@ -117,7 +92,7 @@ def upload_resume():
     
     session['messages'] = [{"role": "system", "content": tone}]
     
-    result = groq_chat(session['messages'])
+    result = groq_client.chat(session['messages'])
     if 'choices' in result and len(result['choices']) > 0:
         first_question = result['choices'][0]['message']['content']
         session['messages'].append({"role": "assistant", "content": first_question})
@@ -153,7 +128,7 @@ def chat_endpoint():
     
     session['messages'].append({"role": "system", "content": prompt})
     
-    result = groq_chat(session['messages'])
+    result = groq_client.chat(session['messages'])
     if 'choices' in result and len(result['choices']) > 0:
         assistant_message = result['choices'][0]['message']['content']
         session['messages'].append({"role": "assistant", "content": assistant_message})
@@ -212,7 +187,7 @@ def get_next_main_question():
     
     session['messages'] = [{"role": "system", "content": prompt}]
     
-    result = groq_chat(session['messages'])
+    result = groq_client.chat(session['messages'])
     if 'choices' in result and len(result['choices']) > 0:
         assistant_message = result['choices'][0]['message']['content']
         session['messages'].append({"role": "assistant", "content": assistant_message})
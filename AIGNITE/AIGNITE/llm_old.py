@@ -1,11 +1,11 @@
 from flask import Flask, render_template, request, jsonify, session
-import requests
 import os
 from werkzeug.utils import secure_filename
 import pytesseract
 from PIL import Image
 import fitz  
 from docx import Document
+from llm_client import GroqClient
 from rag_system import RAGSystem
 import time
 from rag_system import RAGSystem
@@ -24,9 +24,8 @@ rag_system = RAGSystem()
 if not os.path.exists('uploads'):
     os.makedirs('uploads')
 
-def load_api_key():
-    with open('key.txt', 'r') as f:
-        return f.read().strip().replace('API: ', '')
+# Pooled Groq client shared by every route
+groq_client = GroqClient()
 
 def extract_text_from_file(filepath):
     filename = os.path.basename(filepath).lower()
@@ -56,30 +55,6 @@ def extract_text_from_file(filepath):
     else:
         return f"Unsupported file format: {filename}"
 
-def groq_chat(messages, api_key=None):
-    if not api_key:
-        api_key = load_api_key()
-    
-    url = "https://api.groq.com/openai/v1/chat/completions"
-    headers = {
-        "Authorization": f"Bearer {api_key}",
-        "Content-Type": "application/json"
-    }
-    
-    data = {
-        "messages": messages,
-        "model": "llama-3.1-8b-instant",
-        "temperature": 0.7
-    }
-    
-    try:
-        response = requests.post(url, headers=headers, json=data, timeout=30)
-        return response.json()
-    except requests.exceptions.Timeout:
-        return {'error': {'message': 'Request timed out. Please try again.', 'type': 'timeout'}}
-    except requests.exceptions.ConnectionError:
-        return {'error': {'message': 'Connection failed. Please check your internet connection.', 'type': 'connection_error'}}
-
 @app.route('/')
 def index():
     return render_template('chat.html')
@@ -124,7 +99,7 @@ def upload_resume():
     session['company'] = company
     session['location'] = location
     
-    result = groq_chat(session['messages'])
+    result = groq_client.chat(session['messages'])
     if 'choices' in result and len(result['choices']) > 0:
         first_question = result['choices'][0]['message']['content']
         session['messages'].append({"role": "assistant", "content": first_question})
@@ -160,7 +135,7 @@ def chat_endpoint():
     session['messages'].append({"role": "system", "content": enhanced_prompt})
     
     try:
-        result = groq_chat(session['messages'])
+        result = groq_client.chat(session['messages'])
         if 'choices' in result and len(result['choices']) > 0:
             assistant_message = result['choices'][0]['message']['content']
             session['messages'].append({"role": "assistant", "content": assistant_message})
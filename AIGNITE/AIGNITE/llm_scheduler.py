@@ -0,0 +1,427 @@
+import asyncio
+import os
+import random
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+
+import requests
+
+try:
+    import httpx
+except ImportError:  # only needed by AsyncLLMScheduler
+    httpx = None
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class LLMUnavailable(Exception):
+    """Raised when the circuit breaker is open or a call waited too long for a slot"""
+
+    def __init__(self, message, retry_after=None, error_type='circuit_open'):
+        super().__init__(message)
+        self.retry_after = retry_after
+        self.error_type = error_type
+
+
+def parse_reset(value):
+    """Parse a rate-limit reset header ("7.66s", "2m59.56s", "120ms" or plain seconds) into seconds"""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    total = 0.0
+    for amount, unit in re.findall(r'([\d.]+)(ms|h|m|s)', value):
+        total += float(amount) * {'ms': 0.001, 's': 1, 'm': 60, 'h': 3600}[unit]
+    return total
+
+
+class RateLimitBudget:
+    """Request and token budget as last reported by the provider's x-ratelimit-* headers"""
+
+    def __init__(self):
+        self.remaining_requests = None
+        self.remaining_tokens = None
+        self.requests_reset_at = 0.0
+        self.tokens_reset_at = 0.0
+        self.blocked_until = 0.0
+
+    def update(self, headers, now):
+        remaining = headers.get('x-ratelimit-remaining-requests')
+        if remaining is not None:
+            self.remaining_requests = int(float(remaining))
+            self.requests_reset_at = now + (parse_reset(headers.get('x-ratelimit-reset-requests')) or 0)
+        remaining = headers.get('x-ratelimit-remaining-tokens')
+        if remaining is not None:
+            self.remaining_tokens = int(float(remaining))
+            self.tokens_reset_at = now + (parse_reset(headers.get('x-ratelimit-reset-tokens')) or 0)
+
+    def block(self, seconds, now):
+        self.blocked_until = max(self.blocked_until, now + seconds)
+
+    def wait_time(self, tokens, now):
+        """Seconds to wait before a call estimated at `tokens` fits the budget (0 if it fits now)"""
+        wait = self.blocked_until - now
+        if self.remaining_requests is not None and self.remaining_requests <= 0:
+            wait = max(wait, self.requests_reset_at - now)
+        if self.remaining_tokens is not None and self.remaining_tokens < tokens:
+            wait = max(wait, self.tokens_reset_at - now)
+        return max(0.0, wait)
+
+    def spend(self, tokens):
+        # Optimistic local accounting until the response headers report the real figures
+        if self.remaining_requests is not None:
+            self.remaining_requests -= 1
+        if self.remaining_tokens is not None:
+            self.remaining_tokens -= tokens
+
+
+class CircuitBreaker:
+    """Stops calling the provider after repeated failures, then probes it again after `reset_timeout`"""
+
+    def __init__(self, failure_threshold=5, reset_timeout=30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            if self.opened_at is None:
+                return 'closed'
+            if time.monotonic() - self.opened_at >= self.reset_timeout:
+                return 'half_open'
+            return 'open'
+
+    def allow(self):
+        """Return (wait, probe): wait is 0 if a call may go ahead, else the seconds until the breaker half-opens
+
+        probe is True for the single call let through while half open; its
+        caller must end it with record_success, record_failure or end_probe.
+        """
+        with self._lock:
+            if self.opened_at is None:
+                return 0, False
+            remaining = self.opened_at + self.reset_timeout - time.monotonic()
+            if remaining > 0:
+                return remaining, False
+            # Half open: let a single probe through
+            if self.probing:
+                return self.reset_timeout, False
+            self.probing = True
+            return 0, True
+
+    def end_probe(self):
+        """Let another call probe if this one ended (cancelled, queue timeout) without an outcome"""
+        with self._lock:
+            self.probing = False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self.probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.probing or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+            self.probing = False
+
+
+class _Ticket:
+    __slots__ = ('tokens', 'granted', 'event')
+
+    def __init__(self, tokens, event=None):
+        self.tokens = tokens
+        self.granted = False
+        self.event = event  # asyncio.Event for AsyncLLMScheduler waiters
+
+
+class LLMScheduler:
+    """Admission control for provider calls
+
+    Limits calls in flight to `max_concurrency`, holds them back while the
+    provider's reported request/token budget is exhausted, and hands free slots
+    to waiting sessions round-robin so one busy interview cannot starve the
+    others. Failed calls (429, 5xx, timeouts, connection errors) are retried
+    with full-jitter exponential backoff, honouring Retry-After, and feed a
+    circuit breaker that fails calls fast during an outage.
+    """
+
+    def __init__(self, max_concurrency=8, max_retries=3, base_delay=0.5, max_delay=8.0,
+                 queue_timeout=60, breaker=None):
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.queue_timeout = queue_timeout
+        self.breaker = breaker or CircuitBreaker()
+        self.budget = RateLimitBudget()
+
+        self._queues = OrderedDict()  # session id -> deque of waiting tickets, in round-robin order
+        self._in_flight = 0
+        self._cond = threading.Condition()
+
+        self.calls = 0
+        self.retries = 0
+        self.rate_limited = 0
+        self.rejected = 0
+
+    def run(self, session_id, send, tokens=0):
+        """Call send() (which returns a requests.Response) under the scheduler's policy
+
+        Returns the last response, which may still be an error after the retries
+        run out. Raises LLMUnavailable without calling the provider while the
+        breaker is open, and re-raises the last timeout/connection error. Other
+        errors from send() count as breaker failures and are raised at once.
+        """
+        attempt = 0
+        while True:
+            probe = self._check_breaker()
+            try:
+                self._acquire(session_id, tokens)
+                try:
+                    response = send()
+                except self.transient_errors:
+                    self._release(None)
+                    delay = self._after_error(attempt)
+                    if delay is None:
+                        raise
+                except Exception:
+                    self._release(None)
+                    self.breaker.record_failure()
+                    raise
+                else:
+                    self._release(response)
+                    delay = self._after_response(response, attempt)
+                    if delay is None:
+                        return response
+                    response.close()
+            finally:
+                if probe:
+                    self.breaker.end_probe()
+
+            attempt += 1
+            time.sleep(delay)
+
+    transient_errors = (requests.exceptions.Timeout, requests.exceptions.ConnectionError)
+
+    def _check_breaker(self):
+        """Raise LLMUnavailable while the breaker is open; returns True if this call is the half-open probe"""
+        wait, probe = self.breaker.allow()
+        if wait:
+            with self._cond:
+                self.rejected += 1
+            raise LLMUnavailable('The interviewer is temporarily unavailable. Please try again shortly.',
+                                 retry_after=wait)
+        return probe
+
+    def _after_error(self, attempt):
+        """Account for a timeout/connection error; returns the retry delay, or None when out of retries"""
+        self.breaker.record_failure()
+        if attempt >= self.max_retries:
+            return None
+        with self._cond:
+            self.retries += 1
+        return self._backoff(attempt)
+
+    def _after_response(self, response, attempt):
+        """Account for a response; returns the retry delay, or None to hand the response back"""
+        if response.status_code not in RETRY_STATUSES:
+            self.breaker.record_success()
+            return None
+
+        retry_after = parse_reset(response.headers.get('retry-after'))
+        if response.status_code == 429:
+            # The provider is up, just throttling us: pause admissions instead of tripping the breaker
+            self.breaker.record_success()
+            with self._cond:
+                self.rate_limited += 1
+                self.budget.block(retry_after or self._backoff(attempt), time.monotonic())
+        else:
+            self.breaker.record_failure()
+        if attempt >= self.max_retries:
+            return None
+
+        with self._cond:
+            self.retries += 1
+        delay = retry_after if retry_after is not None else self._backoff(attempt)
+        return min(delay, self.max_delay)
+
+    def stats(self):
+        with self._cond:
+            return {
+                'in_flight': self._in_flight,
+                'queued': sum(len(q) for q in self._queues.values()),
+                'calls': self.calls,
+                'retries': self.retries,
+                'rate_limited': self.rate_limited,
+                'rejected': self.rejected,
+                'circuit': self.breaker.state,
+                'remaining_requests': self.budget.remaining_requests,
+                'remaining_tokens': self.budget.remaining_tokens
+            }
+
+    def _backoff(self, attempt):
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def _acquire(self, session_id, tokens):
+        ticket = _Ticket(tokens)
+        deadline = time.monotonic() + self.queue_timeout
+        with self._cond:
+            self._queues.setdefault(session_id, deque()).append(ticket)
+            while True:
+                wait = self._dispatch()
+                if ticket.granted:
+                    return
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._withdraw(session_id, ticket, wait)
+                self._cond.wait(min(remaining, wait) if wait else remaining)
+
+    def _withdraw(self, session_id, ticket, wait):
+        queue = self._queues.get(session_id)
+        if queue is not None:
+            queue.remove(ticket)
+            if not queue:
+                del self._queues[session_id]
+        self.rejected += 1
+        raise LLMUnavailable('Timed out waiting for the LLM rate limit.', retry_after=wait,
+                             error_type='rate_limited')
+
+    def _dispatch(self):
+        """Grant slots round-robin across sessions; returns seconds until the budget frees up (0 if not blocked)"""
+        while self._queues and self._in_flight < self.max_concurrency:
+            session_id, queue = next(iter(self._queues.items()))
+            ticket = queue[0]
+            wait = self.budget.wait_time(ticket.tokens, time.monotonic())
+            if wait:
+                return wait
+
+            queue.popleft()
+            # The session goes to the back of the rotation, or leaves it if it has nothing else waiting
+            del self._queues[session_id]
+            if queue:
+                self._queues[session_id] = queue
+
+            ticket.granted = True
+            if ticket.event is not None:
+                ticket.event.set()
+            self.budget.spend(ticket.tokens)
+            self._in_flight += 1
+            self.calls += 1
+            self._cond.notify_all()
+        return 0
+
+    def _release(self, response):
+        with self._cond:
+            self._in_flight -= 1
+            if response is not None:
+                self.budget.update(response.headers, time.monotonic())
+            self._dispatch()
+            self._cond.notify_all()
+
+
+class AsyncLLMScheduler(LLMScheduler):
+    """LLMScheduler for asyncio callers: send() is a coroutine returning an httpx.Response
+
+    Waiting for a slot, backing off and retrying all await instead of blocking
+    the event loop. Bookkeeping is shared with the threaded scheduler; its lock
+    is only ever held briefly.
+    """
+
+    transient_errors = (httpx.TimeoutException, httpx.TransportError) if httpx else ()
+
+    async def run(self, session_id, send, tokens=0):
+        attempt = 0
+        while True:
+            probe = self._check_breaker()
+            try:
+                await self._acquire_async(session_id, tokens)
+                try:
+                    response = await send()
+                except self.transient_errors:
+                    self._release(None)
+                    delay = self._after_error(attempt)
+                    if delay is None:
+                        raise
+                except Exception:
+                    self._release(None)
+                    self.breaker.record_failure()
+                    raise
+                except BaseException:
+                    # Cancelled: the provider's health is unknown, so only the slot is given back
+                    self._release(None)
+                    raise
+                else:
+                    self._release(response)
+                    delay = self._after_response(response, attempt)
+                    if delay is None:
+                        return response
+                    await response.aclose()
+            finally:
+                if probe:
+                    self.breaker.end_probe()
+
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def _acquire_async(self, session_id, tokens):
+        ticket = _Ticket(tokens, asyncio.Event())
+        deadline = time.monotonic() + self.queue_timeout
+        with self._cond:
+            self._queues.setdefault(session_id, deque()).append(ticket)
+        try:
+            while True:
+                with self._cond:
+                    wait = self._dispatch()
+                    if ticket.granted:
+                        return
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._withdraw(session_id, ticket, wait)
+                try:
+                    await asyncio.wait_for(ticket.event.wait(), min(remaining, wait) if wait else remaining)
+                except asyncio.TimeoutError:
+                    pass
+        except BaseException:
+            # Cancelled while queued (or timed out): give back a slot granted meanwhile, else leave the queue
+            with self._cond:
+                if ticket.granted:
+                    self._in_flight -= 1
+                    self._dispatch()
+                    self._cond.notify_all()
+                else:
+                    queue = self._queues.get(session_id)
+                    if queue is not None and ticket in queue:
+                        queue.remove(ticket)
+                        if not queue:
+                            del self._queues[session_id]
+            raise
+
+
+def estimate_tokens(request):
+    """Rough token cost of a chat request (about 4 characters per token, plus the completion)"""
+    prompt = sum(len(message.get('content') or '') for message in request.get('messages', []))
+    return prompt // 4 + (request.get('max_tokens') or 256)
+
+
+def scheduler_from_env(scheduler_class=None):
+    """Build the LLMScheduler (or AsyncLLMScheduler) configured by LLM_* environment variables"""
+    return (scheduler_class or LLMScheduler)(
+        max_concurrency=int(os.environ.get('LLM_MAX_CONCURRENCY', '8')),
+        max_retries=int(os.environ.get('LLM_MAX_RETRIES', '3')),
+        queue_timeout=float(os.environ.get('LLM_QUEUE_TIMEOUT', '60')),
+        breaker=CircuitBreaker(
+            failure_threshold=int(os.environ.get('LLM_BREAKER_FAILURES', '5')),
+            reset_timeout=float(os.environ.get('LLM_BREAKER_RESET', '30'))
+        )
+    )
@@ -0,0 +1,133 @@
+import os
+import threading
+from collections import OrderedDict, defaultdict, deque
+
+
+class _Totals:
+    """Running totals for one group of LLM calls"""
+
+    __slots__ = ('calls', 'cache_hits', 'errors', 'prompt_tokens', 'completion_tokens', 'seconds', 'max_seconds')
+
+    def __init__(self):
+        self.calls = 0
+        self.cache_hits = 0
+        self.errors = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+
+    def add(self, usage, seconds, cached, error):
+        self.calls += 1
+        self.seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        if cached:
+            self.cache_hits += 1
+        if error:
+            self.errors += 1
+        if usage and not cached:
+            self.prompt_tokens += usage.get('prompt_tokens') or 0
+            self.completion_tokens += usage.get('completion_tokens') or 0
+
+    def as_dict(self, prices):
+        input_price, output_price = prices
+        return {
+            'calls': self.calls,
+            'cache_hits': self.cache_hits,
+            'errors': self.errors,
+            'prompt_tokens': self.prompt_tokens,
+            'completion_tokens': self.completion_tokens,
+            'total_tokens': self.prompt_tokens + self.completion_tokens,
+            'llm_seconds': round(self.seconds, 3),
+            'avg_ms': round(self.seconds / self.calls * 1000, 1) if self.calls else 0.0,
+            'max_ms': round(self.max_seconds * 1000, 1),
+            'cost_usd': round((self.prompt_tokens * input_price + self.completion_tokens * output_price) / 1e6, 6)
+        }
+
+
+class UsageTracker:
+    """Token, latency and cost accounting for LLM calls, per session and per call site
+
+    The client records every call with the interview session it served and a
+    call site label ("first_question", "follow_up", "main_question", ...).
+    Prices are in USD per million tokens. Only the `max_sessions` most recently
+    active sessions are kept.
+    """
+
+    def __init__(self, input_price=0.0, output_price=0.0, max_sessions=10000, latency_samples=1000):
+        self.prices = (input_price, output_price)
+        self.max_sessions = max_sessions
+        self._sessions = OrderedDict()  # session id -> {call site -> _Totals}
+        self._sites = defaultdict(_Totals)
+        self._latencies = defaultdict(lambda: deque(maxlen=latency_samples))
+        self._lock = threading.Lock()
+
+    def record(self, session_id, call_site, usage, seconds, cached=False, error=False):
+        call_site = call_site or 'other'
+        with self._lock:
+            self._sites[call_site].add(usage, seconds, cached, error)
+            if not cached:
+                self._latencies[call_site].append(seconds)
+
+            if session_id is not None:
+                sites = self._sessions.get(session_id)
+                if sites is None:
+                    sites = self._sessions[session_id] = defaultdict(_Totals)
+                    if len(self._sessions) > self.max_sessions:
+                        self._sessions.popitem(last=False)
+                else:
+                    self._sessions.move_to_end(session_id)
+                sites[call_site].add(usage, seconds, cached, error)
+
+    def session(self, session_id):
+        """Totals and per-call-site breakdown for one session (zeros if it made no calls)"""
+        with self._lock:
+            sites = self._sessions.get(session_id, {})
+            total = _Totals()
+            for totals in sites.values():
+                self._merge(total, totals)
+            result = total.as_dict(self.prices)
+            result['by_call_site'] = {site: totals.as_dict(self.prices) for site, totals in sites.items()}
+            return result
+
+    def snapshot(self):
+        """Service-wide totals per call site, with latency percentiles over recent calls"""
+        with self._lock:
+            by_site = {}
+            total = _Totals()
+            for site, totals in self._sites.items():
+                self._merge(total, totals)
+                row = totals.as_dict(self.prices)
+                samples = sorted(self._latencies[site])
+                if samples:
+                    row['p50_ms'] = round(samples[len(samples) // 2] * 1000, 1)
+                    row['p95_ms'] = round(samples[min(len(samples) - 1, int(len(samples) * 0.95))] * 1000, 1)
+                by_site[site] = row
+
+            result = total.as_dict(self.prices)
+            result['tracked_sessions'] = len(self._sessions)
+            result['by_call_site'] = by_site
+            return result
+
+    def discard(self, session_id):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    @staticmethod
+    def _merge(into, totals):
+        into.calls += totals.calls
+        into.cache_hits += totals.cache_hits
+        into.errors += totals.errors
+        into.prompt_tokens += totals.prompt_tokens
+        into.completion_tokens += totals.completion_tokens
+        into.seconds += totals.seconds
+        into.max_seconds = max(into.max_seconds, totals.max_seconds)
+
+
+def usage_from_env():
+    """Build the UsageTracker priced by LLM_PRICE_INPUT / LLM_PRICE_OUTPUT (USD per million tokens)"""
+    # Defaults are Groq's list prices for llama-3.1-8b-instant
+    return UsageTracker(
+        input_price=float(os.environ.get('LLM_PRICE_INPUT', '0.05')),
+        output_price=float(os.environ.get('LLM_PRICE_OUTPUT', '0.08'))
+    )
@@ -0,0 +1,167 @@
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+import fitz
+
+from resume_parser import IMAGE_EXTENSIONS, ocr_image, ocr_pdf_page, single_page_pdf
+
+
+class OCRTimeout(Exception):
+    pass
+
+
+class OCRQueue:
+    """Background OCR for image resumes and scanned PDFs
+
+    Tesseract runs in a process pool. A PDF's text layer is read directly and
+    only its text-less pages are rendered and OCR'd, up to `workers` pages in
+    parallel, stopping once max_chars of text are collected. Each page gets
+    `page_timeout` seconds of Tesseract time and a whole job `job_timeout`
+    seconds; pages cut off by either come back empty.
+
+    submit() returns a job id straight away; get() reports the job's status
+    and, once it is done, whatever the on_done callback returned for the text.
+    Only the `max_jobs` most recent jobs are remembered.
+    """
+
+    def __init__(self, workers=2, page_timeout=60, job_timeout=180, dpi=200, max_jobs=1000):
+        self.workers = workers
+        self.page_timeout = page_timeout
+        self.job_timeout = job_timeout
+        self.dpi = dpi
+        self.max_jobs = max_jobs
+
+        self._pool = ProcessPoolExecutor(max_workers=workers)
+        self._runner = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='ocr-job')
+        self._jobs = OrderedDict()  # job id -> status dict
+        self._lock = threading.Lock()
+
+    def submit(self, data, filename, max_chars=None, on_done=None):
+        """Queue OCR of an upload and return the job id; on_done(text) runs in the background when it finishes"""
+        job_id = str(uuid.uuid4())
+        with self._lock:
+            self._jobs[job_id] = {
+                'job_id': job_id,
+                'status': 'queued',
+                'filename': filename,
+                'created_at': time.time(),
+                'finished_at': None,
+                'ocr_pages': 0,
+                'timed_out_pages': 0,
+                'error': None,
+                'result': None
+            }
+            while len(self._jobs) > self.max_jobs:
+                self._jobs.popitem(last=False)
+        self._runner.submit(self._run, job_id, data, filename, max_chars, on_done)
+        return job_id
+
+    def get(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def extract(self, data, filename, max_chars=None, job_id=None):
+        """Text of an image or PDF upload with OCR for scanned pages; blocks until done"""
+        deadline = time.monotonic() + self.job_timeout
+        if os.path.basename(filename).lower().endswith(IMAGE_EXTENSIONS):
+            futures = [self._pool.submit(ocr_image, data, self.page_timeout)]
+            self._update(job_id, ocr_pages=1)
+            text = self._collect(futures, deadline, job_id)[0]
+            return text[:max_chars] if max_chars is not None else text
+
+        sections = []
+        pending = []  # (index in sections, future) for pages being OCR'd
+        ocr_pages = 0
+        collected = 0
+        with fitz.open(stream=data, filetype='pdf') as doc:
+            for page in doc:
+                if max_chars is not None and collected >= max_chars or time.monotonic() > deadline:
+                    break
+                text = page.get_text()
+                if text.strip():
+                    sections.append(text)
+                    collected += len(text)
+                    continue
+
+                sections.append('')
+                pending.append((len(sections) - 1, self._pool.submit(
+                    ocr_pdf_page, single_page_pdf(doc, page.number), self.dpi, self.page_timeout)))
+                ocr_pages += 1
+                self._update(job_id, ocr_pages=ocr_pages)
+                # OCR a batch of pages in parallel, then see whether the budget is met before queueing more
+                if len(pending) >= self.workers:
+                    collected += self._fill(sections, pending, deadline, job_id)
+
+        self._fill(sections, pending, deadline, job_id)
+        text = ''.join(sections)
+        return text[:max_chars] if max_chars is not None else text
+
+    def stats(self):
+        with self._lock:
+            counts = {}
+            for job in self._jobs.values():
+                counts[job['status']] = counts.get(job['status'], 0) + 1
+            return {'workers': self.workers, 'jobs': len(self._jobs), 'by_status': counts}
+
+    def _run(self, job_id, data, filename, max_chars, on_done):
+        self._update(job_id, status='running')
+        try:
+            text = self.extract(data, filename, max_chars, job_id)
+            if not text.strip() and (self.get(job_id) or {}).get('timed_out_pages'):
+                raise OCRTimeout('OCR timed out')
+            result = on_done(text) if on_done else {'text': text}
+            self._update(job_id, status='done', result=result, finished_at=time.time())
+        except Exception as e:
+            self._update(job_id, status='failed', error=str(e), finished_at=time.time())
+
+    def _fill(self, sections, pending, deadline, job_id):
+        """Wait for the pending OCR pages and put their text in place; returns the characters added"""
+        texts = self._collect([future for _, future in pending], deadline, job_id)
+        for (index, _), text in zip(pending, texts):
+            sections[index] = text
+        pending.clear()
+        return sum(len(text) for text in texts)
+
+    def _collect(self, futures, deadline, job_id):
+        texts = []
+        timed_out = 0
+        for future in futures:
+            try:
+                texts.append(future.result(timeout=max(0, deadline - time.monotonic())))
+            except FutureTimeout:
+                future.cancel()
+                texts.append('')
+                timed_out += 1
+            except RuntimeError:
+                # pytesseract kills Tesseract and raises RuntimeError when the page timeout is hit
+                texts.append('')
+                timed_out += 1
+        if timed_out:
+            with self._lock:
+                job = self._jobs.get(job_id)
+                if job:
+                    job['timed_out_pages'] += timed_out
+        return texts
+
+    def _update(self, job_id, **fields):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job:
+                job.update(fields)
+
+
+def ocr_queue_from_env():
+    """Build the OCRQueue configured by OCR_* environment variables, or None if disabled (OCR then runs inline)"""
+    if os.environ.get('OCR_QUEUE', '1').lower() in ('0', 'false', 'no', 'off'):
+        return None
+    return OCRQueue(
+        workers=int(os.environ.get('OCR_WORKERS', '2')),
+        page_timeout=float(os.environ.get('OCR_PAGE_TIMEOUT', '60')),
+        job_timeout=float(os.environ.get('OCR_JOB_TIMEOUT', '180')),
+        dpi=int(os.environ.get('OCR_DPI', '200'))
+    )
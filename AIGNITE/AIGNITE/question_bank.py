@@ -0,0 +1,171 @@
+"""Precomputed main questions, keyed by (interview type, company, role, difficulty, category).
+
+Company and role questions do not depend on the candidate, so they can be
+generated in bulk ahead of time and served instantly. Build or extend a bank:
+
+    python question_bank.py --type technical --companies "TCS,Infosys" --roles "Data Analyst,Software Engineer" --per-key 12
+    python question_bank.py --type hr --companies TCS --roles "Data Analyst" --difficulties medium --per-key 8
+
+The apps read the bank named by QUESTION_BANK_DB (default question_bank.db)
+when it exists, and fall back to live generation for keys it does not cover.
+"""
+import argparse
+import os
+import random
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+BANK_CATEGORIES = ('company', 'role')
+DIFFICULTIES = ('easy', 'medium', 'hard')
+
+
+def bank_key(interview_type, company, role, difficulty, category):
+    normalise = lambda value: ' '.join(str(value or '').lower().split())
+    return (normalise(interview_type), normalise(company), normalise(role), normalise(difficulty), normalise(category))
+
+
+class QuestionBank:
+    """SQLite-backed question pool, held in memory for lookups"""
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._questions = {}
+        self.hits = 0
+        self.misses = 0
+
+        with sqlite3.connect(db_path) as db:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS questions ("
+                "id INTEGER PRIMARY KEY, interview_type TEXT NOT NULL, company TEXT NOT NULL, role TEXT NOT NULL, "
+                "difficulty TEXT NOT NULL, category TEXT NOT NULL, question TEXT NOT NULL, created_at REAL NOT NULL, "
+                "UNIQUE (interview_type, company, role, difficulty, category, question))"
+            )
+            db.execute(
+                "CREATE INDEX IF NOT EXISTS questions_key "
+                "ON questions (interview_type, company, role, difficulty, category)"
+            )
+        self.reload()
+
+    @classmethod
+    def from_env(cls):
+        """Open the bank named by QUESTION_BANK_DB, or return None if no bank has been built"""
+        path = os.environ.get('QUESTION_BANK_DB', 'question_bank.db')
+        return cls(path) if os.path.exists(path) else None
+
+    def reload(self):
+        questions = {}
+        with sqlite3.connect(self.db_path) as db:
+            rows = db.execute(
+                "SELECT interview_type, company, role, difficulty, category, question FROM questions ORDER BY id"
+            )
+            for *key, question in rows:
+                questions.setdefault(tuple(key), []).append(question)
+        with self._lock:
+            self._questions = questions
+
+    def sample(self, interview_type, company, role, difficulty, category, exclude=()):
+        """Return a random banked question for the key that is not in `exclude`, or None"""
+        with self._lock:
+            pool = self._questions.get(bank_key(interview_type, company, role, difficulty, category), [])
+            candidates = [question for question in pool if question not in exclude]
+            if not candidates:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return random.choice(candidates)
+
+    def covers(self, interview_type, company, role, difficulty, category):
+        with self._lock:
+            return bank_key(interview_type, company, role, difficulty, category) in self._questions
+
+    def add(self, interview_type, company, role, difficulty, category, questions):
+        """Store questions for the key, skipping duplicates; returns how many were new"""
+        key = bank_key(interview_type, company, role, difficulty, category)
+        now = time.time()
+        with sqlite3.connect(self.db_path) as db:
+            before = db.total_changes
+            db.executemany(
+                "INSERT OR IGNORE INTO questions "
+                "(interview_type, company, role, difficulty, category, question, created_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(*key, question, now) for question in questions]
+            )
+            added = db.total_changes - before
+        self.reload()
+        return added
+
+    def stats(self):
+        with self._lock:
+            return {
+                'keys': len(self._questions),
+                'questions': sum(len(pool) for pool in self._questions.values()),
+                'hits': self.hits,
+                'misses': self.misses
+            }
+
+
+def clean_question(text):
+    return ' '.join(text.strip().strip('"').split())
+
+
+def build(bank, interview_type, companies, roles, difficulties, per_key, workers):
+    """Generate up to `per_key` distinct questions for every key and store them in the bank"""
+    if interview_type == 'hr':
+        import hr_llm as app_module
+        from search_engine import DuckDuckGoSearch
+        search = DuckDuckGoSearch()
+        company_data = {company: search.search_company_info(company) for company in companies}
+
+        def prompt_for(company, role, difficulty, category):
+            question_count = 2 if category == 'company' else 4
+            return app_module.main_question_prompt(question_count, difficulty, company, role, '',
+                                                   company_data[company])[1]
+    else:
+        import llm as app_module
+
+        def prompt_for(company, role, difficulty, category):
+            template = app_module.DIFFICULTY_SETTINGS[difficulty][category]
+            return template.format(company=company, role=role)
+
+    client = app_module.groq_client
+
+    def generate(prompt):
+        # Sampled hotter than live questions so a pool has some variety
+        result = client.chat([{"role": "system", "content": prompt}], temperature=1.0, use_cache=False,
+                             call_site='question_bank')
+        if 'choices' in result and len(result['choices']) > 0:
+            return clean_question(result['choices'][0]['message']['content'])
+        return None
+
+    keys = [(company, role, difficulty, category)
+            for company in companies for role in roles for difficulty in difficulties for category in BANK_CATEGORIES]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for company, role, difficulty, category in keys:
+            prompt = prompt_for(company, role, difficulty, category)
+            # Over-generate a little since some completions repeat
+            questions = {q for q in executor.map(generate, [prompt] * (per_key + per_key // 2)) if q}
+            added = bank.add(interview_type, company, role, difficulty, category, sorted(questions)[:per_key])
+            print(f'{interview_type} | {company} | {role} | {difficulty} | {category}: {added} new')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--db', default=os.environ.get('QUESTION_BANK_DB', 'question_bank.db'))
+    parser.add_argument('--type', choices=['technical', 'hr'], default='technical')
+    parser.add_argument('--companies', required=True, help='comma separated')
+    parser.add_argument('--roles', required=True, help='comma separated')
+    parser.add_argument('--difficulties', default=','.join(DIFFICULTIES), help='comma separated')
+    parser.add_argument('--per-key', type=int, default=10, help='questions to store per key')
+    parser.add_argument('--workers', type=int, default=4, help='concurrent generation requests')
+    args = parser.parse_args()
+
+    split = lambda value: [item.strip() for item in value.split(',') if item.strip()]
+    bank = QuestionBank(args.db)
+    build(bank, args.type, split(args.companies), split(args.roles), split(args.difficulties), args.per_key, args.workers)
+    print(bank.stats())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,216 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+
+def content_digest(data):
+    """SHA-256 of an upload's bytes"""
+    return hashlib.sha256(data).hexdigest()
+
+
+class ResumeTextCache:
+    """Persistent cache of text extracted from uploaded resumes
+
+    Entries are keyed by the SHA-256 of the uploaded bytes, the file extension
+    (extraction dispatches on it) and the extractor name, since the apps do not
+    all extract text the same way. Each entry keeps the text with a few derived
+    fields and how long extraction took. At most `max_entries` are kept, least
+    recently used first out, and entries unused for `ttl` seconds are dropped.
+    Blank text is never cached: it usually means OCR was off, failed or timed
+    out, and a later upload of the same file should get another try.
+    """
+
+    def __init__(self, db_path, max_entries=2000, ttl=30 * 24 * 3600):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.ttl = ttl
+
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+        self.hits = 0
+        self.misses = 0
+        self.seconds_saved = 0.0
+
+        with self._db() as db:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS resume_text ("
+                "digest TEXT NOT NULL, file_type TEXT NOT NULL, extractor TEXT NOT NULL, text TEXT NOT NULL, "
+                "chars INTEGER NOT NULL, words INTEGER NOT NULL, lines INTEGER NOT NULL, "
+                "extract_seconds REAL NOT NULL, created_at REAL NOT NULL, used_at REAL NOT NULL, "
+                "PRIMARY KEY (digest, file_type, extractor))"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS resume_text_used_at ON resume_text (used_at)")
+
+    @staticmethod
+    def file_type(filename):
+        return os.path.splitext(filename)[1].lower()
+
+    def get(self, digest, filename, extractor='default'):
+        """Return the cached entry as a dict (text, chars, words, lines, ...), or None"""
+        now = time.time()
+        with self._db() as db:
+            row = db.execute(
+                "SELECT text, chars, words, lines, extract_seconds FROM resume_text "
+                "WHERE digest = ? AND file_type = ? AND extractor = ? AND used_at >= ?",
+                (digest, self.file_type(filename), extractor, now - self.ttl)
+            ).fetchone()
+            if row and not row[0].strip():
+                row = None  # stored before blank text stopped being cached
+            if row:
+                db.execute(
+                    "UPDATE resume_text SET used_at = ? WHERE digest = ? AND file_type = ? AND extractor = ?",
+                    (now, digest, self.file_type(filename), extractor)
+                )
+
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.seconds_saved += row[4]
+        return {'text': row[0], 'chars': row[1], 'words': row[2], 'lines': row[3], 'extract_seconds': row[4]}
+
+    def put(self, digest, filename, text, extract_seconds, extractor='default'):
+        if not text.strip():
+            return
+        now = time.time()
+        with self._db() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO resume_text "
+                "(digest, file_type, extractor, text, chars, words, lines, extract_seconds, created_at, used_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (digest, self.file_type(filename), extractor, text, len(text), len(text.split()),
+                 text.count('\n') + 1 if text else 0, extract_seconds, now, now)
+            )
+            # Drop stale rows, then the least recently used beyond the size cap
+            db.execute("DELETE FROM resume_text WHERE used_at < ?", (now - self.ttl,))
+            db.execute(
+                "DELETE FROM resume_text WHERE rowid IN ("
+                "SELECT rowid FROM resume_text ORDER BY used_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+
+    def extract(self, data, filename, extract, extractor='default'):
+        """Return extract(data, filename), served from the cache when the same bytes were extracted before"""
+        digest = content_digest(data)
+        entry = self.get(digest, filename, extractor)
+        if entry is not None:
+            return entry['text']
+
+        start = time.perf_counter()
+        text = extract(data, filename)
+        self.put(digest, filename, text, time.perf_counter() - start, extractor)
+        return text
+
+    def stats(self):
+        entries = self._db().execute("SELECT COUNT(*) FROM resume_text").fetchone()[0]
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+                'extract_seconds_saved': round(self.seconds_saved, 3)
+            }
+
+    def _db(self):
+        # sqlite3 connections cannot be shared across threads, so keep one per thread
+        db = getattr(self._local, 'db', None)
+        if db is None:
+            db = sqlite3.connect(self.db_path, timeout=5)
+            db.execute("PRAGMA journal_mode=WAL")
+            self._local.db = db
+        return db
+
+
+class UploadStore:
+    """Content-addressed copies of uploaded resumes
+
+    Each upload is written once as <sha256><extension>, so identical uploads
+    share a file and different uploads never overwrite each other. At most
+    every `prune_interval` seconds, a save removes stored files older than
+    `max_age` seconds, then the oldest until the directory holds at most
+    `max_bytes`. Files not named by a digest are left alone.
+    """
+
+    def __init__(self, directory, max_bytes=500 * 1024 * 1024, max_age=30 * 24 * 3600, prune_interval=60):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.prune_interval = prune_interval
+        self._next_prune = 0.0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def save(self, data, filename):
+        """Store the upload and return its path"""
+        digest = content_digest(data)
+        path = os.path.join(self.directory, digest + ResumeTextCache.file_type(filename))
+        with self._lock:
+            if os.path.exists(path):
+                os.utime(path)
+            else:
+                partial = f'{path}.{os.getpid()}.{threading.get_ident()}.part'
+                with open(partial, 'wb') as f:
+                    f.write(data)
+                os.replace(partial, path)
+            # Pruning scans the whole directory, so not on every save
+            if time.monotonic() >= self._next_prune:
+                self._next_prune = time.monotonic() + self.prune_interval
+                self._prune()
+        return path
+
+    def _stored_files(self):
+        files = []
+        for entry in os.scandir(self.directory):
+            name, _ = os.path.splitext(entry.name)
+            if entry.is_file() and len(name) == 64 and all(c in '0123456789abcdef' for c in name):
+                stat = entry.stat()
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+        return sorted(files)
+
+    def _prune(self):
+        cutoff = time.time() - self.max_age
+        files = self._stored_files()
+        total = sum(size for _, size, _ in files)
+        for mtime, size, path in files:
+            if mtime >= cutoff and total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+
+# Next to this module rather than in the working directory, so every app shares one cache wherever it is started
+DEFAULT_RESUME_CACHE_DB = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'resume_cache.db')
+
+
+def resume_cache_from_env():
+    """Build the ResumeTextCache configured by RESUME_CACHE_* environment variables, or None if disabled"""
+    if os.environ.get('RESUME_CACHE', '1').lower() in ('0', 'false', 'no', 'off'):
+        return None
+    return ResumeTextCache(
+        db_path=os.environ.get('RESUME_CACHE_DB', DEFAULT_RESUME_CACHE_DB),
+        max_entries=int(os.environ.get('RESUME_CACHE_SIZE', '2000')),
+        ttl=float(os.environ.get('RESUME_CACHE_TTL', str(30 * 24 * 3600)))
+    )
+
+
+def upload_store_from_env(directory):
+    """Build the UploadStore configured by UPLOAD_STORE_* environment variables, or None unless UPLOAD_STORE=1
+
+    Nothing reads the stored copies back, so keeping them is opt-in.
+    """
+    if os.environ.get('UPLOAD_STORE', '0').lower() not in ('1', 'true', 'yes', 'on'):
+        return None
+    return UploadStore(
+        directory,
+        max_bytes=int(float(os.environ.get('UPLOAD_STORE_MAX_MB', '500')) * 1024 * 1024),
+        max_age=float(os.environ.get('UPLOAD_STORE_MAX_AGE', str(30 * 24 * 3600)))
+    )
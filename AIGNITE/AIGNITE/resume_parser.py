@@ -0,0 +1,226 @@
+import io
+import os
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from xml.etree import ElementTree
+
+import fitz
+import pytesseract
+from PIL import Image
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.tiff')
+
+# The interview prompts only use the start of a resume, so the upload routes stop parsing after this much text
+RESUME_TEXT_CHARS = int(os.environ.get('RESUME_TEXT_CHARS', '2000'))
+
+# Resume text cache names for the budgeted extractors below; the budget is part of the name
+RESUME_TEXT_KEY = f'default:{RESUME_TEXT_CHARS}'
+HR_RESUME_TEXT_KEY = f'hr:{RESUME_TEXT_CHARS}'
+
+# Whole-document PDF extraction is split across processes only from this many pages up
+PDF_PARALLEL_MIN_PAGES = int(os.environ.get('PDF_PARALLEL_MIN_PAGES', '8'))
+
+W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+
+def page_text(page, pdf_spans=False):
+    text = page.get_text()
+    if pdf_spans:
+        spans = [span["text"] + " "
+                 for block in page.get_text("dict")["blocks"]
+                 for line in block.get("lines", [])
+                 for span in line["spans"]]
+        text += ''.join(spans)
+    return text
+
+
+def open_pdf(source):
+    """Open a PDF given as bytes or as a file path"""
+    if isinstance(source, (bytes, bytearray)):
+        return fitz.open(stream=source, filetype='pdf')
+    return fitz.open(source)
+
+
+def pdf_pages_text(source, start, stop, pdf_spans=False):
+    """Text of pages start..stop-1 of a PDF (bytes or path), one string per page (run in worker processes)"""
+    with open_pdf(source) as doc:
+        return [page_text(doc[number], pdf_spans) for number in range(start, stop)]
+
+
+def extraction_pool_from_env():
+    """Process pool for CPU-bound parsing, with EXTRACT_WORKERS workers (default one per CPU)"""
+    return ProcessPoolExecutor(max_workers=int(os.environ.get('EXTRACT_WORKERS', os.cpu_count() or 2)))
+
+
+def extract_pdf_parallel(source, executor, workers=None, pdf_spans=False):
+    """Whole text of a PDF, with its pages split into contiguous ranges across a process pool
+
+    Library only: the upload routes stop after RESUME_TEXT_CHARS and never
+    call this. Given a file path, each worker opens the file and reads its own
+    pages; given bytes, each worker is sent a document holding only its range
+    rather than a copy of the whole upload. Documents under
+    PDF_PARALLEL_MIN_PAGES pages are read in this process, as shipping them to
+    a worker costs more than it saves.
+    """
+    futures = []
+    with open_pdf(source) as doc:
+        page_count = doc.page_count
+        if page_count < PDF_PARALLEL_MIN_PAGES:
+            return ''.join(page_text(page, pdf_spans) for page in doc)
+
+        chunks = min(workers or os.cpu_count() or 2, page_count)
+        bounds = [page_count * i // chunks for i in range(chunks + 1)]
+        for start, stop in zip(bounds, bounds[1:]):
+            if isinstance(source, str):
+                futures.append(executor.submit(pdf_pages_text, source, start, stop, pdf_spans))
+            else:
+                futures.append(executor.submit(pdf_pages_text, page_range_pdf(doc, start, stop), 0, stop - start,
+                                               pdf_spans))
+    return ''.join(text for future in futures for text in future.result())
+
+
+def docx_paragraph_text(paragraph):
+    parts = []
+    for node in paragraph.iter():
+        if node.tag == W + 't':
+            parts.append(node.text or '')
+        elif node.tag == W + 'tab':
+            parts.append('\t')
+        elif node.tag in (W + 'br', W + 'cr'):
+            parts.append('\n')
+    return ''.join(parts)
+
+
+def iter_docx_blocks(parent):
+    """Yield a DOCX body's text in document order: one line per paragraph and per table row"""
+    for node in parent:
+        if node.tag == W + 'p':
+            yield docx_paragraph_text(node) + "\n"
+        elif node.tag == W + 'tbl':
+            for row in node.iter(W + 'tr'):
+                cells = [' '.join(docx_paragraph_text(p) for p in cell.iter(W + 'p')).strip()
+                         for cell in row.findall(W + 'tc')]
+                yield ' | '.join(cells) + "\n"
+        elif node.tag == W + 'sdt':
+            # Content controls wrap ordinary paragraphs and tables
+            for content in node.findall(W + 'sdtContent'):
+                yield from iter_docx_blocks(content)
+
+
+def iter_text(data, filename, pdf_spans=False, skip_scanned=False):
+    """Yield the text of an upload section by section: PDF pages, DOCX paragraphs and table rows, or the whole file
+
+    Parsing happens as the generator is consumed, so a caller that stops early
+    never touches the remaining pages. With pdf_spans, each PDF page's text is
+    followed by its text spans again (the HR app's extraction). With
+    skip_scanned, images and scanned (text-less) PDF pages yield None instead
+    of being OCR'd or read as empty.
+    """
+    filename = os.path.basename(filename).lower()
+
+    if filename.endswith('.txt'):
+        yield data.decode('utf-8')
+
+    elif filename.endswith('.pdf'):
+        with fitz.open(stream=data, filetype='pdf') as doc:
+            for page in doc:
+                text = page_text(page, pdf_spans)
+                if skip_scanned and not text.strip() and page.get_images():
+                    yield None
+                else:
+                    yield text
+
+    elif filename.endswith('.docx'):
+        # Read word/document.xml directly; python-docx's doc.paragraphs skips tables
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            root = ElementTree.fromstring(archive.read('word/document.xml'))
+        yield from iter_docx_blocks(root.find(W + 'body'))
+
+    elif filename.endswith(IMAGE_EXTENSIONS):
+        if skip_scanned:
+            yield None
+        else:
+            with Image.open(io.BytesIO(data)) as image:
+                yield pytesseract.image_to_string(image)
+
+    else:
+        yield f"Unsupported file format: {filename}"
+
+
+def extract_text(data, filename, pdf_spans=False, max_chars=None, executor=None, skip_scanned=False):
+    """Extract resume text from uploaded bytes; the format is taken from the filename
+
+    With max_chars, parsing stops once that many characters have been collected
+    and the text is cut to max_chars. Without it the whole document is read, and
+    with a process pool `executor` a long PDF's pages are read in parallel.
+    With skip_scanned, returns None for images and for PDFs with a scanned page
+    within the text read, so the caller can send them to OCR; other uploads are
+    parsed only once either way.
+    """
+    if executor is not None and max_chars is None and filename.lower().endswith('.pdf'):
+        text = extract_pdf_parallel(data, executor, pdf_spans=pdf_spans)
+        return text.strip() if pdf_spans else text
+
+    parts = []
+    collected = 0
+    sections = iter_text(data, filename, pdf_spans, skip_scanned)
+    for section in sections:
+        if section is None:
+            sections.close()
+            return None
+        parts.append(section)
+        collected += len(section)
+        if max_chars is not None and collected >= max_chars:
+            sections.close()
+            break
+
+    text = ''.join(parts)
+    if pdf_spans and filename.lower().endswith('.pdf'):
+        text = text.strip()
+    return text[:max_chars] if max_chars is not None else text
+
+
+def resume_text(data, filename, skip_scanned=False):
+    """The start of a resume, as much as the interview prompts need (None if skip_scanned and it needs OCR)"""
+    return extract_text(data, filename, max_chars=RESUME_TEXT_CHARS, skip_scanned=skip_scanned)
+
+
+def hr_resume_text(data, filename, skip_scanned=False):
+    return extract_text(data, filename, pdf_spans=True, max_chars=RESUME_TEXT_CHARS, skip_scanned=skip_scanned)
+
+
+def ocr_image(data, timeout=0):
+    """Tesseract text of an image; raises RuntimeError if it runs longer than timeout seconds (0 = no limit)"""
+    with Image.open(io.BytesIO(data)) as image:
+        return pytesseract.image_to_string(image, timeout=timeout)
+
+
+def ocr_pdf_page(page_pdf, dpi=200, timeout=0):
+    """Render a single-page PDF (see single_page_pdf) and OCR it"""
+    with fitz.open(stream=page_pdf, filetype='pdf') as doc:
+        pixmap = doc[0].get_pixmap(dpi=dpi)
+    return ocr_image(pixmap.tobytes('png'), timeout)
+
+
+def page_range_pdf(doc, start, stop):
+    """Pages start..stop-1 of an open document as PDF bytes, small enough to hand to a worker process"""
+    with fitz.open() as range_doc:
+        range_doc.insert_pdf(doc, from_page=start, to_page=stop - 1)
+        return range_doc.tobytes()
+
+
+def single_page_pdf(doc, page_number):
+    return page_range_pdf(doc, page_number, page_number + 1)
+
+
+def load_text(path, pdf_spans=False, executor=None):
+    """Full text of a stored upload (library only; no route reads whole documents)
+
+    With a process pool `executor`, a long PDF's workers read their page
+    ranges straight from the file.
+    """
+    if executor is not None and path.lower().endswith('.pdf'):
+        text = extract_pdf_parallel(path, executor, pdf_spans=pdf_spans)
+        return text.strip() if pdf_spans else text
+    with open(path, 'rb') as f:
+        return extract_text(f.read(), path, pdf_spans)
@@ -0,0 +1,164 @@
+"""Throughput and latency benchmark for /api/detect-faces.
+
+Synthesizes frames at several resolutions (pure noise, and 0, 1 and several
+fixture faces on a noisy background), then drives the endpoint with a number
+of concurrent simulated candidates, each streaming frames under its own
+session id. Reports throughput, p50/p95/p99 latency and server CPU time per
+frame for each scenario.
+
+In-process (Flask test client, no network):
+    python benchmarks/bench_detect_faces.py --frames 50 --concurrency 4
+
+Over HTTP against a running server (CPU time read from /api/detect-faces/stats):
+    python benchmarks/bench_detect_faces.py --url http://localhost:5000 --output bench.json
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from frames import RESOLUTIONS, encode_jpeg, load_face_fixtures, make_frame
+
+SCENARIOS = ['noise', 'no_face', 'one_face', 'multi_face']
+
+def scenario_frame(scenario, width, height, seed, faces):
+    if scenario == 'noise':
+        rng = np.random.default_rng(seed)
+        return rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+    count = {'no_face': 0, 'one_face': 1, 'multi_face': 3}[scenario]
+    return make_frame(width, height, count, seed=seed, faces=faces)
+
+class InProcessTarget:
+    """Calls the Flask app directly through its test client"""
+
+    def __init__(self):
+        import flask_api
+        self.app = flask_api.app
+
+    def post(self, session_id, jpeg):
+        client = self.app.test_client()
+        response = client.post(f'/api/detect-faces?session_id={session_id}', data=jpeg,
+                               content_type='image/jpeg')
+        return response.status_code
+
+    def cpu_seconds(self):
+        return time.process_time()
+
+class HttpTarget:
+    """Posts raw JPEG frames to a running server over keep-alive connections"""
+
+    def __init__(self, url):
+        import requests
+        self.url = url.rstrip('/')
+        self.requests = requests
+        self.sessions = {}
+
+    def post(self, session_id, jpeg):
+        http = self.sessions.setdefault(session_id, self.requests.Session())
+        response = http.post(f'{self.url}/api/detect-faces', params={'session_id': session_id},
+                             data=jpeg, headers={'Content-Type': 'image/jpeg'})
+        return response.status_code
+
+    def cpu_seconds(self):
+        return self.requests.get(f'{self.url}/api/detect-faces/stats').json()['process_cpu_seconds']
+
+def percentile(values, pct):
+    return float(np.percentile(values, pct)) if values else None
+
+def run_scenario(target, jpegs, concurrency):
+    """Stream the frames from `concurrency` simulated candidates; returns the measurements"""
+    def candidate(index):
+        session_id = f'bench-{uuid.uuid4()}'
+        latencies, statuses = [], []
+        for jpeg in jpegs[index::concurrency]:
+            start = time.perf_counter()
+            statuses.append(target.post(session_id, jpeg))
+            latencies.append(time.perf_counter() - start)
+        return latencies, statuses
+
+    cpu_start = target.cpu_seconds()
+    wall_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        outcomes = list(executor.map(candidate, range(concurrency)))
+    wall = time.perf_counter() - wall_start
+    cpu = target.cpu_seconds() - cpu_start
+
+    latencies = [value * 1000 for lat, _ in outcomes for value in lat]
+    statuses = [status for _, st in outcomes for status in st]
+    ok = statuses.count(200)
+
+    return {
+        'frames': len(statuses),
+        'ok': ok,
+        'rejected_429': statuses.count(429),
+        'errors': len(statuses) - ok - statuses.count(429),
+        'throughput_fps': round(len(statuses) / wall, 2),
+        'latency_ms': {
+            'p50': round(percentile(latencies, 50), 2),
+            'p95': round(percentile(latencies, 95), 2),
+            'p99': round(percentile(latencies, 99), 2),
+        },
+        'cpu_ms_per_frame': round(cpu / len(statuses) * 1000, 3),
+    }
+
+def git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--url', help='benchmark a running server instead of the in-process app')
+    parser.add_argument('--frames', type=int, default=40, help='frames per scenario and resolution')
+    parser.add_argument('--concurrency', type=int, default=4, help='simulated candidates streaming at once')
+    parser.add_argument('--resolutions', default=','.join(f'{w}x{h}' for w, h in RESOLUTIONS),
+                        help='comma separated WIDTHxHEIGHT list')
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS), help='comma separated subset of ' + ', '.join(SCENARIOS))
+    parser.add_argument('--output', help='write results as JSON to this file')
+    args = parser.parse_args()
+
+    target = HttpTarget(args.url) if args.url else InProcessTarget()
+    faces = load_face_fixtures()
+    resolutions = [tuple(int(v) for v in r.split('x')) for r in args.resolutions.split(',')]
+
+    results = []
+    for width, height in resolutions:
+        for scenario in args.scenarios.split(','):
+            jpegs = [encode_jpeg(scenario_frame(scenario, width, height, i, faces)) for i in range(args.frames)]
+            row = run_scenario(target, jpegs, args.concurrency)
+            row.update({'resolution': f'{width}x{height}', 'scenario': scenario,
+                        'bytes_per_frame': round(sum(map(len, jpegs)) / len(jpegs))})
+            results.append(row)
+
+            print(f"{row['resolution']:<10} {scenario:<11} {row['throughput_fps']:>8.1f} fps  "
+                  f"p50 {row['latency_ms']['p50']:>7.1f}  p95 {row['latency_ms']['p95']:>7.1f}  "
+                  f"p99 {row['latency_ms']['p99']:>7.1f} ms  cpu {row['cpu_ms_per_frame']:>7.2f} ms/frame  "
+                  f"429s {row['rejected_429']}")
+
+    report = {
+        'revision': git_revision(),
+        'mode': 'http' if args.url else 'in-process',
+        'concurrency': args.concurrency,
+        'frames_per_scenario': args.frames,
+        'python': platform.python_version(),
+        'cpu_count': os.cpu_count(),
+        'results': results,
+    }
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""Compare the base64 JSON and raw binary upload paths of /api/detect-faces.
+
+Reports bytes on the wire per frame and server CPU time per frame, both for
+the payload decode alone and for the full request through the Flask app.
+
+    python benchmarks/bench_frame_upload.py --frames 200
+"""
+import argparse
+import base64
+import json
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import flask_api
+from frames import RESOLUTIONS, encode_jpeg, make_frame
+
+def json_payload(jpeg_bytes):
+    data_url = 'data:image/jpeg;base64,' + base64.b64encode(jpeg_bytes).decode('ascii')
+    return json.dumps({'image': data_url, 'session_id': 'bench'}).encode('utf-8')
+
+def decode_json(body):
+    data = json.loads(body)
+    image_bytes = base64.b64decode(data['image'].split(',')[1])
+    return cv2.imdecode(np.frombuffer(image_bytes, np.uint8), cv2.IMREAD_COLOR)
+
+def decode_binary(body):
+    return cv2.imdecode(np.frombuffer(body, np.uint8), cv2.IMREAD_COLOR)
+
+def cpu_per_call(func, bodies):
+    start = time.process_time()
+    for body in bodies:
+        func(body)
+    return (time.process_time() - start) / len(bodies)
+
+def run(frame_count):
+    client = flask_api.app.test_client()
+    results = []
+
+    for width, height in RESOLUTIONS:
+        jpegs = [encode_jpeg(make_frame(width, height, 1, seed=i)) for i in range(frame_count)]
+        json_bodies = [json_payload(jpeg) for jpeg in jpegs]
+
+        def post_json(body):
+            client.post('/api/detect-faces', data=body, content_type='application/json')
+
+        def post_binary(body):
+            client.post('/api/detect-faces?session_id=bench', data=body, content_type='image/jpeg')
+
+        results.append({
+            'resolution': f'{width}x{height}',
+            'json': {
+                'bytes_per_frame': sum(map(len, json_bodies)) / frame_count,
+                'decode_cpu_ms': cpu_per_call(decode_json, json_bodies) * 1000,
+                'request_cpu_ms': cpu_per_call(post_json, json_bodies) * 1000,
+            },
+            'binary': {
+                'bytes_per_frame': sum(map(len, jpegs)) / frame_count,
+                'decode_cpu_ms': cpu_per_call(decode_binary, jpegs) * 1000,
+                'request_cpu_ms': cpu_per_call(post_binary, jpegs) * 1000,
+            },
+        })
+
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--frames', type=int, default=100, help='frames per resolution')
+    parser.add_argument('--output', help='write results as JSON to this file')
+    args = parser.parse_args()
+
+    results = run(args.frames)
+
+    for row in results:
+        print(row['resolution'])
+        for path in ('json', 'binary'):
+            stats = row[path]
+            print(f"  {path:<7} {stats['bytes_per_frame']:>9.0f} B/frame  "
+                  f"decode {stats['decode_cpu_ms']:6.3f} ms  request {stats['request_cpu_ms']:6.3f} ms")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,147 @@
+"""End-to-end load driver for the interview API (AIGNITE/AIGNITE/llm.py or llm_async.py).
+
+Simulates concurrent candidates, each running start-interview, then
+submit-answer a number of times, then get-summary, and reports per-route
+latency percentiles. Point the server at the local LLM stand-in so runs are
+repeatable and cost no provider quota:
+
+    python benchmarks/mock_llm_server.py --latency-ms 400
+    cd AIGNITE/AIGNITE && GROQ_API_URL=http://127.0.0.1:8900/openai/v1/chat/completions GROQ_API_KEY=test python llm.py
+    python benchmarks/bench_interview_flow.py --url http://localhost:5000 --candidates 20 --answers 6
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_detect_faces import git_revision, percentile
+
+ANSWERS = [
+    "I built a Flask service that cached results in Redis and cut response times by half.",
+    "We profiled the hot path, moved the heavy parsing into a worker queue and added retries.",
+    "I would start from the logs and metrics, reproduce it locally, then bisect recent changes.",
+    "Mostly pandas and SQL for the analysis, with a small dashboard for the stakeholders.",
+]
+
+RESUME = """Jane Candidate
+Software Engineer
+Projects: Flask REST API with Redis caching; data pipeline in pandas and Airflow; React dashboard.
+Skills: Python, SQL, Docker, Kubernetes, PostgreSQL, machine learning basics.
+"""
+
+
+def candidate(url, answers, stream, company, role):
+    """Run one interview; returns a list of (route, seconds, status)"""
+    http = requests.Session()
+    timings = []
+
+    def timed(route, method, path, **kwargs):
+        start = time.perf_counter()
+        try:
+            response = http.request(method, f'{url}{path}', timeout=120, **kwargs)
+            if stream and route == 'submit-answer/stream':
+                response.content  # the done event arrives last
+            status = response.status_code
+        except requests.RequestException:
+            response, status = None, 'error'
+        timings.append((route, time.perf_counter() - start, status))
+        return response
+
+    files = {'resume': (f'resume-{uuid.uuid4().hex[:8]}.txt', RESUME.encode(), 'text/plain')}
+    response = timed('start-interview', 'POST', '/api/start-interview', files=files,
+                     data={'company': company, 'role': role, 'difficulty': 'medium'})
+    if response is None or response.status_code != 200:
+        return timings
+    session_id = response.json()['session_id']
+
+    route = 'submit-answer/stream' if stream else 'submit-answer'
+    suffix = '/stream' if stream else ''
+    for i in range(answers):
+        response = timed(route, 'POST', f'/api/submit-answer/{session_id}{suffix}',
+                         json={'answer': ANSWERS[i % len(ANSWERS)]})
+        if response is None or response.status_code != 200:
+            break
+        if not stream and response.json().get('completed'):
+            break
+        if stream and b'"completed": true' in response.content:
+            break
+
+    timed('get-summary', 'GET', f'/api/get-summary/{session_id}')
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--url', default='http://localhost:5000')
+    parser.add_argument('--candidates', type=int, default=10, help='concurrent simulated candidates')
+    parser.add_argument('--answers', type=int, default=6, help='answers each candidate submits')
+    parser.add_argument('--stream', action='store_true', help='use /api/submit-answer/<id>/stream')
+    parser.add_argument('--company', default='TCS')
+    parser.add_argument('--role', default='Data Analyst')
+    parser.add_argument('--output', help='write results as JSON to this file')
+    args = parser.parse_args()
+    url = args.url.rstrip('/')
+
+    wall_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.candidates) as executor:
+        runs = list(executor.map(lambda _: candidate(url, args.answers, args.stream, args.company, args.role),
+                                 range(args.candidates)))
+    wall = time.perf_counter() - wall_start
+
+    by_route = defaultdict(list)
+    for timings in runs:
+        for route, seconds, status in timings:
+            by_route[route].append((seconds * 1000, status))
+
+    results = []
+    for route in ['start-interview', 'submit-answer', 'submit-answer/stream', 'get-summary']:
+        samples = by_route.get(route)
+        if not samples:
+            continue
+        latencies = [ms for ms, _ in samples]
+        row = {
+            'route': route,
+            'requests': len(samples),
+            'errors': sum(1 for _, status in samples if status != 200),
+            'latency_ms': {
+                'p50': round(percentile(latencies, 50), 1),
+                'p95': round(percentile(latencies, 95), 1),
+                'p99': round(percentile(latencies, 99), 1),
+                'max': round(float(np.max(latencies)), 1),
+            },
+        }
+        results.append(row)
+        print(f"{route:<22} {row['requests']:>5} req  {row['errors']:>3} err  p50 {row['latency_ms']['p50']:>8.1f}  "
+              f"p95 {row['latency_ms']['p95']:>8.1f}  p99 {row['latency_ms']['p99']:>8.1f}  "
+              f"max {row['latency_ms']['max']:>8.1f} ms")
+
+    total = sum(len(samples) for samples in by_route.values())
+    print(f'{total} requests from {args.candidates} candidates in {wall:.1f} s ({total / wall:.1f} req/s)')
+
+    report = {
+        'revision': git_revision(),
+        'url': url,
+        'candidates': args.candidates,
+        'answers': args.answers,
+        'stream': args.stream,
+        'wall_seconds': round(wall, 2),
+        'python': platform.python_version(),
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""Latency and accuracy of the reduced-grayscale fast mode of the face detector.
+
+For each downscale factor, decodes and detects fixture frames with 0, 1 and 2
+faces and reports mean latency, face-count accuracy against the known count,
+and mean IoU of the boxes against full-resolution detection.
+
+    python benchmarks/bench_reduced_decode.py --frames 20
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from face_engine import detect_faces_in_image
+from frames import RESOLUTIONS, encode_jpeg, load_face_fixtures, make_frame
+
+DOWNSCALES = [1, 2, 4]
+FACE_COUNTS = [0, 1, 2]
+
+def iou(a, b):
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    ix = max(0, min(ax + aw, bx + bw) - max(ax, bx))
+    iy = max(0, min(ay + ah, by + bh) - max(ay, by))
+    inter = ix * iy
+    union = aw * ah + bw * bh - inter
+    return inter / union if union else 0.0
+
+def mean_best_iou(boxes, reference):
+    """Average, over reference boxes, of the best IoU with any detected box"""
+    if not reference:
+        return None
+    return sum(max((iou(r, b) for b in boxes), default=0.0) for r in reference) / len(reference)
+
+def run(frame_count):
+    faces = load_face_fixtures()
+    results = []
+
+    for width, height in RESOLUTIONS:
+        frames = [
+            (count, encode_jpeg(make_frame(width, height, count, seed=i, faces=faces)))
+            for count in FACE_COUNTS for i in range(frame_count)
+        ]
+        reference = [detect_faces_in_image(jpeg, downscale=1) for _, jpeg in frames]
+
+        for downscale in DOWNSCALES:
+            start = time.perf_counter()
+            detections = [detect_faces_in_image(jpeg, downscale=downscale) for _, jpeg in frames]
+            elapsed = time.perf_counter() - start
+
+            correct = sum(1 for (count, _), boxes in zip(frames, detections) if len(boxes) == count)
+            ious = [mean_best_iou(boxes, ref) for boxes, ref in zip(detections, reference)]
+            ious = [value for value in ious if value is not None]
+
+            results.append({
+                'resolution': f'{width}x{height}',
+                'downscale': downscale,
+                'latency_ms': elapsed / len(frames) * 1000,
+                'count_accuracy': correct / len(frames),
+                'mean_iou_vs_full': sum(ious) / len(ious) if ious else None,
+            })
+
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--frames', type=int, default=20, help='frames per resolution and face count')
+    parser.add_argument('--output', help='write results as JSON to this file')
+    args = parser.parse_args()
+
+    results = run(args.frames)
+
+    print(f"{'resolution':<11} {'scale':>5} {'ms/frame':>9} {'count acc':>10} {'IoU':>6}")
+    for row in results:
+        iou_text = f"{row['mean_iou_vs_full']:.2f}" if row['mean_iou_vs_full'] is not None else '-'
+        print(f"{row['resolution']:<11} {row['downscale']:>5} {row['latency_ms']:>9.2f} "
+              f"{row['count_accuracy']:>10.0%} {iou_text:>6}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+"""Pages/second of resume PDF text extraction, serial and page-parallel.
+
+Reads every PDF in AIGNITE/AIGNITE/uploads (or --dir) with resume_parser, once
+in this process and once with page ranges split across a process pool, and
+checks that both give the same text.
+Uploaded resumes are only a few pages, so --min-pages also builds a long
+document per file by repeating its pages, standing in for long CVs and
+portfolios:
+
+    python benchmarks/bench_resume_extract.py --workers 4 --min-pages 60 --output extract.json
+"""
+import argparse
+import glob
+import json
+import os
+import platform
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import fitz
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+APP_DIR = os.path.join(HERE, '..', 'AIGNITE', 'AIGNITE')
+sys.path.insert(0, HERE)
+sys.path.insert(0, APP_DIR)
+
+from bench_detect_faces import git_revision
+from resume_parser import extract_pdf_parallel, pdf_pages_text
+
+
+def repeat_pages(data, min_pages):
+    """The PDF with its pages repeated until it has at least min_pages"""
+    with fitz.open(stream=data, filetype='pdf') as source, fitz.open() as doc:
+        while doc.page_count < min_pages:
+            doc.insert_pdf(source)
+        return doc.tobytes()
+
+
+def timed(extract, documents, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for data in documents:
+            extract(data)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--dir', default=os.path.join(APP_DIR, 'uploads'))
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 2)
+    parser.add_argument('--min-pages', type=int, default=0, help='also time each file repeated to this many pages')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per mode; the fastest is reported')
+    parser.add_argument('--output', help='write results as JSON to this file')
+    args = parser.parse_args()
+
+    originals = []
+    for path in sorted(glob.glob(os.path.join(args.dir, '*.pdf'))):
+        with open(path, 'rb') as f:
+            originals.append(f.read())
+    if not originals:
+        sys.exit(f'no PDFs in {args.dir}')
+
+    corpora = [('uploads', originals)]
+    if args.min_pages:
+        corpora.append((f'uploads x{args.min_pages}+ pages', [repeat_pages(data, args.min_pages) for data in originals]))
+
+    results = []
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        # Start the workers before timing anything
+        list(executor.map(pdf_pages_text, [originals[0]] * args.workers, [0] * args.workers, [1] * args.workers))
+
+        for name, documents in corpora:
+            pages = 0
+            for data in documents:
+                with fitz.open(stream=data, filetype='pdf') as doc:
+                    pages += doc.page_count
+
+            def serial(data):
+                with fitz.open(stream=data, filetype='pdf') as doc:
+                    return ''.join(pdf_pages_text(data, 0, doc.page_count))
+
+            def parallel(data):
+                return extract_pdf_parallel(data, executor, args.workers)
+
+            for data in documents:
+                if parallel(data) != serial(data):
+                    sys.exit(f'{name}: parallel extraction does not match serial extraction')
+
+            modes = [
+                ('serial', serial),
+                (f'parallel x{args.workers}', parallel),
+            ]
+            for mode, extract in modes:
+                seconds = timed(extract, documents, args.repeat)
+                row = {
+                    'corpus': name,
+                    'mode': mode,
+                    'files': len(documents),
+                    'pages': pages,
+                    'seconds': round(seconds, 4),
+                    'pages_per_second': round(pages / seconds, 1),
+                }
+                results.append(row)
+                print(f"{name:<24} {mode:<12} {row['files']:>4} files {pages:>6} pages  {row['seconds']:>8.3f} s  "
+                      f"{row['pages_per_second']:>9.1f} pages/s")
+
+    report = {
+        'revision': git_revision(),
+        'workers': args.workers,
+        'cpu_count': os.cpu_count(),
+        'pymupdf': fitz.VersionBind,
+        'python': platform.python_version(),
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
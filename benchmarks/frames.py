@@ -0,0 +1,48 @@
+import os
+import cv2
+import numpy as np
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+# Resolutions the webcam client may send (FaceDetector.jsx uses 320x240)
+RESOLUTIONS = [(320, 240), (640, 480), (1280, 720)]
+
+def load_face_fixtures():
+    """Load the face crops in benchmarks/fixtures"""
+    faces = []
+    for name in sorted(os.listdir(FIXTURES_DIR)):
+        if name.lower().endswith(('.jpg', '.jpeg', '.png')):
+            image = cv2.imread(os.path.join(FIXTURES_DIR, name), cv2.IMREAD_COLOR)
+            if image is not None:
+                faces.append(image)
+    return faces
+
+def make_frame(width, height, face_count, seed=0, faces=None):
+    """Synthesize a BGR webcam-like frame with face_count faces pasted on a noisy background"""
+    rng = np.random.default_rng(seed)
+    background = rng.integers(60, 200, (height, width, 3), dtype=np.uint8)
+    frame = cv2.GaussianBlur(background, (0, 0), 5)
+
+    if face_count == 0:
+        return frame
+
+    faces = faces or load_face_fixtures()
+    slot_width = width // face_count
+    for i in range(face_count):
+        face = faces[i % len(faces)]
+        face_h = min(int(height * 0.6), int(slot_width * 0.9 * face.shape[0] / face.shape[1]))
+        face_w = int(face_h * face.shape[1] / face.shape[0])
+        x = i * slot_width + (slot_width - face_w) // 2
+        y = (height - face_h) // 2
+        frame[y:y + face_h, x:x + face_w] = cv2.resize(face, (face_w, face_h))
+
+    # Sensor noise so consecutive frames are never byte-identical
+    noise = rng.normal(0, 4, frame.shape)
+    return np.clip(frame + noise, 0, 255).astype(np.uint8)
+
+def encode_jpeg(frame, quality=80):
+    """Encode a frame the way canvas.toBlob('image/jpeg', 0.8) does"""
+    ok, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    if not ok:
+        raise ValueError('JPEG encoding failed')
+    return buffer.tobytes()
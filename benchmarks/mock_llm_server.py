@@ -0,0 +1,178 @@
+"""Deterministic local stand-in for the Groq chat-completions API.
+
+Speaks the OpenAI-compatible /openai/v1/chat/completions protocol (JSON and
+`stream: true` server-sent events), with configurable latency, optional 429
+injection and responses derived only from the request, so runs repeat exactly.
+
+    python benchmarks/mock_llm_server.py --port 8900 --latency-ms 400 --jitter 0.3 --rate-limit 0.05
+    GROQ_API_URL=http://localhost:8900/openai/v1/chat/completions GROQ_API_KEY=test python llm.py
+
+Responses are picked from TEMPLATES by a hash of the messages, or read from
+--responses, a JSON list of strings (they may use {n}, {topic} and {model}).
+"""
+import argparse
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+
+from flask import Flask, Response, jsonify, request
+
+TEMPLATES = [
+    "Can you walk me through how you used {topic} in your most recent project?",
+    "What trade-offs did you consider when choosing {topic} for that work?",
+    "How would you debug a production issue involving {topic}?",
+    "Describe a time {topic} did not behave as you expected. What did you do?",
+    "How would you explain {topic} to a new team member?",
+]
+
+STOPWORDS = {
+    'about', 'after', 'again', 'answer', 'based', 'being', 'could', 'mentioned', 'question', 'questions',
+    'resume', 'should', 'their', 'there', 'these', 'which', 'while', 'words', 'would', 'interview',
+    'technical', 'specific', 'intermediate', 'advanced', 'basic', 'projects', 'skills', 'experience',
+}
+
+app = Flask(__name__)
+config = {}
+counters = {'requests': 0, 'rate_limited': 0}
+counters_lock = threading.Lock()
+
+
+def request_seed(body):
+    canonical = json.dumps(body.get('messages', []), sort_keys=True)
+    return int(hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:16], 16)
+
+
+def pick_topic(messages, seed):
+    """Choose a deterministic topic word from the prompt so answers look related to it"""
+    text = ' '.join(m.get('content') or '' for m in messages)
+    words = sorted({w for w in re.findall(r'[A-Za-z][A-Za-z+#.-]{4,}', text) if w.lower() not in STOPWORDS})
+    return words[seed % len(words)] if words else 'this technology'
+
+
+def completion_text(body, seed):
+    messages = body.get('messages', [])
+    responses = config['responses'] or TEMPLATES
+    template = responses[seed % len(responses)]
+    return template.format(n=len(messages), topic=pick_topic(messages, seed), model=body.get('model', ''))
+
+
+def latency_seconds(seed):
+    """Log-normal latency around --latency-ms, deterministic per request unless --random-latency"""
+    rng = random.Random(None if config['random_latency'] else seed)
+    median = config['latency_ms'] / 1000
+    return median * math.exp(rng.gauss(0, config['jitter'])) if config['jitter'] else median
+
+
+def count_tokens(text):
+    return max(1, len(text) // 4)
+
+
+def rate_limit_headers():
+    return {
+        'x-ratelimit-limit-requests': '14400',
+        'x-ratelimit-remaining-requests': '14000',
+        'x-ratelimit-reset-requests': '6s',
+        'x-ratelimit-limit-tokens': '18000',
+        'x-ratelimit-remaining-tokens': '17000',
+        'x-ratelimit-reset-tokens': '3.2s',
+    }
+
+
+@app.route('/openai/v1/chat/completions', methods=['POST'])
+def chat_completions():
+    body = request.get_json(force=True)
+    seed = request_seed(body)
+
+    with counters_lock:
+        counters['requests'] += 1
+        throttle = config['rate_limit'] and config['rng'].random() < config['rate_limit']
+        if throttle:
+            counters['rate_limited'] += 1
+
+    if throttle:
+        response = jsonify({'error': {'message': 'Rate limit reached (mock)', 'type': 'rate_limit_exceeded'}})
+        response.status_code = 429
+        response.headers['Retry-After'] = str(config['retry_after'])
+        return response
+
+    text = completion_text(body, seed)
+    prompt_tokens = sum(count_tokens(m.get('content') or '') for m in body.get('messages', []))
+    usage = {
+        'prompt_tokens': prompt_tokens,
+        'completion_tokens': count_tokens(text),
+        'total_tokens': prompt_tokens + count_tokens(text),
+    }
+    completion_id = f'chatcmpl-mock-{seed:x}'
+    model = body.get('model', 'mock')
+    delay = latency_seconds(seed)
+
+    if body.get('stream'):
+        pieces = re.findall(r'\S+\s*', text)
+        first_token = delay * config['ttft_fraction']
+        per_piece = (delay - first_token) / max(1, len(pieces))
+
+        def events():
+            time.sleep(first_token)
+            for piece in pieces:
+                chunk = {'id': completion_id, 'object': 'chat.completion.chunk', 'model': model,
+                         'choices': [{'index': 0, 'delta': {'content': piece}, 'finish_reason': None}]}
+                yield f'data: {json.dumps(chunk)}\n\n'
+                time.sleep(per_piece)
+            final = {'id': completion_id, 'object': 'chat.completion.chunk', 'model': model,
+                     'choices': [{'index': 0, 'delta': {}, 'finish_reason': 'stop'}],
+                     'x_groq': {'usage': usage}}
+            yield f'data: {json.dumps(final)}\n\n'
+            yield 'data: [DONE]\n\n'
+
+        return Response(events(), mimetype='text/event-stream', headers=rate_limit_headers())
+
+    time.sleep(delay)
+    response = jsonify({
+        'id': completion_id,
+        'object': 'chat.completion',
+        'created': int(time.time()),
+        'model': model,
+        'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': text}, 'finish_reason': 'stop'}],
+        'usage': usage,
+    })
+    response.headers.update(rate_limit_headers())
+    return response
+
+
+@app.route('/stats', methods=['GET'])
+def stats():
+    with counters_lock:
+        return jsonify(dict(counters))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8900)
+    parser.add_argument('--latency-ms', type=float, default=300, help='median completion latency')
+    parser.add_argument('--jitter', type=float, default=0.25, help='log-normal sigma of the latency (0 = fixed)')
+    parser.add_argument('--random-latency', action='store_true', help='draw latency randomly instead of per request hash')
+    parser.add_argument('--ttft-fraction', type=float, default=0.3, help='share of the latency before the first streamed token')
+    parser.add_argument('--rate-limit', type=float, default=0.0, help='probability of answering 429')
+    parser.add_argument('--seed', type=int, default=0, help='seed for 429 injection')
+    parser.add_argument('--retry-after', type=float, default=1.0, help='Retry-After seconds sent with 429s')
+    parser.add_argument('--responses', help='JSON file with a list of response templates')
+    args = parser.parse_args()
+
+    responses = None
+    if args.responses:
+        with open(args.responses) as f:
+            responses = json.load(f)
+
+    config.update(latency_ms=args.latency_ms, jitter=args.jitter, random_latency=args.random_latency,
+                  ttft_fraction=args.ttft_fraction, rate_limit=args.rate_limit, retry_after=args.retry_after,
+                  responses=responses, rng=random.Random(args.seed))
+    app.run(host=args.host, port=args.port, threaded=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""Drive the /ws/detect-faces streaming endpoint with synthetic webcam frames.
+
+Sends frames at a fixed rate from one thread and reads results on another,
+then reports how many frames were sent, processed and dropped by the server's
+latest-frame-wins backpressure.
+
+    python flask_api.py
+    python benchmarks/ws_client.py --url ws://localhost:5000/ws/detect-faces --fps 30 --seconds 5
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+
+import simple_websocket
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from frames import encode_jpeg, make_frame
+
+def run(url, fps, seconds, width, height, face_count):
+    session_id = str(uuid.uuid4())
+    ws = simple_websocket.Client.connect(f'{url}?session_id={session_id}')
+    frames = [encode_jpeg(make_frame(width, height, face_count, seed=i)) for i in range(30)]
+    results = []
+
+    def reader():
+        try:
+            while True:
+                message = ws.receive()
+                if message is None:
+                    break
+                results.append(json.loads(message))
+        except simple_websocket.ConnectionClosed:
+            pass
+
+    reader_thread = threading.Thread(target=reader, daemon=True)
+    reader_thread.start()
+
+    sent = 0
+    start = time.perf_counter()
+    try:
+        while time.perf_counter() - start < seconds:
+            ws.send(frames[sent % len(frames)])
+            sent += 1
+            time.sleep(max(0.0, start + sent / fps - time.perf_counter()))
+
+        # Give the server a moment to answer the last frame, then end the session
+        time.sleep(0.5)
+        ws.send(json.dumps({'type': 'end'}))
+    except simple_websocket.ConnectionClosed:
+        pass
+
+    # The server closes the socket after "end"; wait for that, then close our side if it is still open
+    reader_thread.join(timeout=5)
+    try:
+        ws.close()
+    except simple_websocket.ConnectionClosed:
+        pass
+
+    last = results[-1] if results else {}
+    return {
+        'sent_frames': sent,
+        'processed_frames': len(results),
+        'dropped_frames': last.get('dropped_frames', 0),
+        'last_result': last,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--url', default='ws://localhost:5000/ws/detect-faces')
+    parser.add_argument('--fps', type=float, default=10)
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--width', type=int, default=320)
+    parser.add_argument('--height', type=int, default=240)
+    parser.add_argument('--faces', type=int, default=1)
+    args = parser.parse_args()
+
+    summary = run(args.url, args.fps, args.seconds, args.width, args.height, args.faces)
+    print(json.dumps(summary, indent=2))
+
+if __name__ == '__main__':
+    main()
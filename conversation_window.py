@@ -0,0 +1,115 @@
+import re
+from collections import deque
+from functools import lru_cache
+
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+
+
+@lru_cache(maxsize=4096)
+def count_tokens(text):
+    """Approximate LLM token count: words and punctuation, with long words split every 4 characters"""
+    return sum(1 + (len(piece) - 1) // 4 for piece in _TOKEN_RE.findall(text))
+
+
+def _first_sentence(text, limit):
+    text = ' '.join(text.split())
+    match = re.search(r'[.?!](\s|$)', text)
+    if match:
+        text = text[:match.end()].strip()
+    return text if len(text) <= limit else text[:limit - 3].rstrip() + '...'
+
+
+class ConversationWindow:
+    """Bounded chat history for one interview
+
+    Keeps the system prompt and the last `keep_exchanges` user/assistant
+    exchanges verbatim. Older exchanges are folded into a short extractive
+    summary (the question asked and the start of the answer), and the whole
+    prompt is held under `token_budget` tokens, so each request costs about
+    the same no matter how long the interview runs.
+    """
+
+    def __init__(self, system_prompt, keep_exchanges=3, token_budget=1500, summary_chars=800):
+        self.system_prompt = system_prompt
+        self.keep_exchanges = keep_exchanges
+        self.token_budget = token_budget
+        self.summary_chars = summary_chars
+
+        self.turns = deque()  # (message, token count)
+        self.summary_lines = deque()
+        self._turn_tokens = 0
+
+    def append(self, role, content):
+        message = {"role": role, "content": content}
+        tokens = count_tokens(content)
+        self.turns.append((message, tokens))
+        self._turn_tokens += tokens
+        self._fold_old_exchanges()
+
+    def discard_pending(self):
+        """Drop a trailing user turn that never got a reply, e.g. when the client went away mid-stream"""
+        if self.turns and self.turns[-1][0]["role"] == "user":
+            _, tokens = self.turns.pop()
+            self._turn_tokens -= tokens
+
+    def messages(self, instruction=None):
+        """Messages for the next request, with an optional one-off system instruction at the end"""
+        self._enforce_budget(count_tokens(instruction) if instruction else 0)
+
+        messages = [{"role": "system", "content": self.system_prompt}]
+        summary = self.summary()
+        if summary:
+            messages.append({"role": "system", "content": summary})
+        messages.extend(message for message, _ in self.turns)
+        if instruction:
+            messages.append({"role": "system", "content": instruction})
+        return messages
+
+    def summary(self):
+        if not self.summary_lines:
+            return ''
+        return "Earlier in this interview:\n" + '\n'.join(self.summary_lines)
+
+    def token_count(self, instruction=None):
+        """Approximate prompt tokens messages(instruction) would send"""
+        total = count_tokens(self.system_prompt) + self._turn_tokens
+        summary = self.summary()
+        if summary:
+            total += count_tokens(summary)
+        if instruction:
+            total += count_tokens(instruction)
+        return total
+
+    def _exchange_count(self):
+        return sum(1 for message, _ in self.turns if message["role"] == "assistant")
+
+    def _fold_old_exchanges(self):
+        # Only fold once the newest exchange is complete, so a pending user turn stays verbatim
+        while self._exchange_count() > self.keep_exchanges:
+            self._fold_oldest()
+
+    def _enforce_budget(self, extra_tokens):
+        while self.token_count() + extra_tokens > self.token_budget and self._exchange_count() > 1:
+            self._fold_oldest()
+        while self.token_count() + extra_tokens > self.token_budget and self.summary_lines:
+            self.summary_lines.popleft()
+
+    def _fold_oldest(self):
+        """Move turns up to and including the oldest assistant reply into the summary"""
+        question, answer = None, []
+        while self.turns:
+            message, tokens = self.turns.popleft()
+            self._turn_tokens -= tokens
+            if message["role"] == "assistant":
+                question = message["content"]
+                break
+            answer.append(message["content"])
+
+        # The user turn before an assistant reply answers the previous question
+        if answer and self.summary_lines and self.summary_lines[-1].endswith('A: -'):
+            self.summary_lines[-1] = self.summary_lines[-1][:-1] + _first_sentence(' '.join(answer), 160)
+        if question:
+            self.summary_lines.append(f"- Q: {_first_sentence(question, 120)} A: -")
+
+        while sum(len(line) + 1 for line in self.summary_lines) > self.summary_chars and len(self.summary_lines) > 1:
+            self.summary_lines.popleft()
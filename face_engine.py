@@ -0,0 +1,410 @@
+import math
+import os
+import pickle
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+import cv2
+import numpy as np
+
+CASCADE_PATH = cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
+DETECTOR_CONFIG_PATH = os.environ.get(
+    'FACE_DETECTOR_CONFIG',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'interview_face_detector.pkl')
+)
+
+# Used for any field the pickled model does not provide
+DEFAULT_DETECTOR_CONFIG = {
+    'scale_factor': 1.1,
+    'min_neighbors': 4,
+    'min_size': (30, 30),
+    'skin_hsv_lower': (0, 20, 70),
+    'skin_hsv_upper': (20, 255, 255),
+    'face_threshold_frames': 5,
+}
+
+class _PickledDetectorModel:
+    """Stand-in for the notebook's InterviewFaceDetectorModel; only receives its attribute dict"""
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+
+class _DetectorConfigUnpickler(pickle.Unpickler):
+    """Unpickler that maps the model class to a plain stand-in and refuses every other global"""
+
+    def find_class(self, module, name):
+        if module == '__main__' and name == 'InterviewFaceDetectorModel':
+            return _PickledDetectorModel
+        raise pickle.UnpicklingError(f'Refusing to load {module}.{name} from detector config')
+
+def load_detector_config(path=DETECTOR_CONFIG_PATH):
+    """Read the tuned cascade and skin-filter parameters from interview_face_detector.pkl"""
+    config = dict(DEFAULT_DETECTOR_CONFIG)
+    try:
+        with open(path, 'rb') as f:
+            model = _DetectorConfigUnpickler(f).load()
+    except (OSError, pickle.UnpicklingError, EOFError):
+        return config
+
+    for key in config:
+        value = getattr(model, key, None)
+        if value is not None:
+            config[key] = tuple(value) if isinstance(value, (list, tuple)) else value
+    return config
+
+DETECTOR_CONFIG = load_detector_config()
+
+_local = threading.local()
+
+def get_cascade():
+    """Return this thread's CascadeClassifier (classifiers are not shared across threads)"""
+    cascade = getattr(_local, 'cascade', None)
+    if cascade is None:
+        cascade = cv2.CascadeClassifier(CASCADE_PATH)
+        _local.cascade = cascade
+    return cascade
+
+# Decode flags for fast mode: libjpeg scales the DCT down while decoding
+REDUCED_GRAYSCALE_FLAGS = {
+    2: cv2.IMREAD_REDUCED_GRAYSCALE_2,
+    4: cv2.IMREAD_REDUCED_GRAYSCALE_4,
+    8: cv2.IMREAD_REDUCED_GRAYSCALE_8,
+}
+REDUCED_COLOR_FLAGS = {
+    2: cv2.IMREAD_REDUCED_COLOR_2,
+    4: cv2.IMREAD_REDUCED_COLOR_4,
+    8: cv2.IMREAD_REDUCED_COLOR_8,
+}
+
+# 1 = full-resolution decode (default); 2/4/8 = reduced fast mode
+DEFAULT_DOWNSCALE = int(os.environ.get('FACE_DETECT_DOWNSCALE', '1'))
+DEFAULT_MIN_FACE_SIZE = int(os.environ.get('FACE_DETECT_MIN_SIZE', DETECTOR_CONFIG['min_size'][0]))
+
+# Opt-in skin-colour prefilter (FACE_SKIN_PREFILTER=1). It needs a colour decode, which rules out the reduced
+# grayscale fast path, and only narrows the cascade search, so it rarely pays for itself
+SKIN_PREFILTER_ENABLED = os.environ.get('FACE_SKIN_PREFILTER', '0') == '1'
+
+def decode_frame(image_bytes, downscale=1, color=False):
+    """Decode an encoded frame, optionally reduced by 2, 4 or 8
+
+    Returns (gray, bgr); bgr is None unless color=True, in which case gray is
+    derived from it. Without colour the frame is decoded straight to grayscale
+    in fast mode.
+    """
+    buffer = np.frombuffer(image_bytes, np.uint8)
+    if downscale not in (1, *REDUCED_GRAYSCALE_FLAGS):
+        raise ValueError(f'Unsupported downscale factor: {downscale}')
+
+    bgr = None
+    if color or downscale == 1:
+        bgr = cv2.imdecode(buffer, cv2.IMREAD_COLOR if downscale == 1 else REDUCED_COLOR_FLAGS[downscale])
+        gray = None if bgr is None else cv2.cvtColor(bgr, cv2.COLOR_BGR2GRAY)
+    else:
+        gray = cv2.imdecode(buffer, REDUCED_GRAYSCALE_FLAGS[downscale])
+
+    if gray is None:
+        raise ValueError('Could not decode image')
+    return gray, bgr if color else None
+
+def skin_region(bgr, config=DETECTOR_CONFIG, thumbnail_width=80):
+    """Cheap first stage: find skin-coloured pixels on a thumbnail
+
+    Returns the (x0, y0, x1, y1) bounding box of the skin pixels in the frame's
+    coordinates, padded by one thumbnail pixel, or None when there are none.
+    The box only narrows the cascade search; a small skin ratio is no proof
+    that the frame has no faces, so callers search the whole frame on None.
+    """
+    height, width = bgr.shape[:2]
+    scale = width / thumbnail_width
+    small = cv2.resize(bgr, (thumbnail_width, max(1, int(height / scale))), interpolation=cv2.INTER_AREA)
+
+    hsv = cv2.cvtColor(small, cv2.COLOR_BGR2HSV)
+    lower = np.array(config['skin_hsv_lower'], dtype=np.uint8)
+    upper = np.array(config['skin_hsv_upper'], dtype=np.uint8)
+    mask = np.all((hsv >= lower) & (hsv <= upper), axis=-1)
+
+    if not mask.any():
+        return None
+
+    rows = np.flatnonzero(mask.any(axis=1))
+    cols = np.flatnonzero(mask.any(axis=0))
+    return (
+        max(0, int((cols[0] - 1) * scale)), max(0, int((rows[0] - 1) * scale)),
+        min(width, int((cols[-1] + 2) * scale)), min(height, int((rows[-1] + 2) * scale))
+    )
+
+def _detect_in_region(gray, cascade, min_size, region=None, config=DETECTOR_CONFIG):
+    """Full cascade pass over the frame, or only over region (x0, y0, x1, y1) padded by one face"""
+    if region is not None:
+        height, width = gray.shape[:2]
+        x0, y0 = max(0, region[0] - min_size), max(0, region[1] - min_size)
+        x1, y1 = min(width, region[2] + min_size), min(height, region[3] + min_size)
+    else:
+        x0, y0 = 0, 0
+        y1, x1 = gray.shape[:2]
+
+    faces = cascade.detectMultiScale(
+        gray[y0:y1, x0:x1], config['scale_factor'], config['min_neighbors'],
+        minSize=(min_size, min_size)
+    )
+    return [(int(x) + x0, int(y) + y0, int(w), int(h)) for (x, y, w, h) in faces]
+
+DEFAULT_DETECT_INTERVAL = int(os.environ.get('FACE_DETECT_INTERVAL', '5'))
+
+# Mean absolute thumbnail difference (0-255) below which a frame counts as unchanged; 0 disables
+DEFAULT_MOTION_THRESHOLD = float(os.environ.get('FACE_MOTION_THRESHOLD', '3.0'))
+DEFAULT_MAX_SKIPPED_FRAMES = int(os.environ.get('FACE_MAX_SKIPPED_FRAMES', '30'))
+
+class MotionGate:
+    """Skips detection for frames that barely differ from the last processed one
+
+    Frames are compared as 32x24 grayscale thumbnails, which averages away
+    sensor noise. After `max_skipped` skips in a row a frame is processed
+    anyway so slow drift cannot hide a change forever.
+    """
+
+    THUMBNAIL_SIZE = (32, 24)
+
+    def __init__(self, threshold=DEFAULT_MOTION_THRESHOLD, max_skipped=DEFAULT_MAX_SKIPPED_FRAMES):
+        self.threshold = threshold
+        self.max_skipped = max_skipped
+        self.thumbnail = None
+        self.faces = None
+        self.consecutive_skips = 0
+        self.skipped = 0
+        self.processed = 0
+
+    def cached_faces(self, gray):
+        """Return the last result if this frame is unchanged, otherwise None"""
+        thumbnail = cv2.resize(gray, self.THUMBNAIL_SIZE, interpolation=cv2.INTER_AREA)
+
+        if (self.threshold > 0 and self.faces is not None
+                and self.consecutive_skips < self.max_skipped
+                and cv2.absdiff(thumbnail, self.thumbnail).mean() < self.threshold):
+            self.consecutive_skips += 1
+            self.skipped += 1
+            return self.faces
+
+        self.thumbnail = thumbnail
+        return None
+
+    def store(self, faces):
+        self.faces = faces
+        self.consecutive_skips = 0
+        self.processed += 1
+
+class FaceTracker:
+    """Detect-then-track state for one webcam stream
+
+    The full-frame cascade runs every `interval` frames. In between, faces are
+    re-detected only inside a window around each last known box, at a narrow
+    range of scales. If any tracked face is lost, or two tracks collapse onto
+    the same face, the tracker falls back to a full detection for that frame.
+    """
+
+    def __init__(self, interval=DEFAULT_DETECT_INTERVAL, margin=0.5):
+        self.interval = max(1, interval)
+        self.margin = margin
+        self.boxes = []
+        self.frame_shape = None
+        self.frames_since_full = 0
+        self.full_detections = 0
+        self.tracked_frames = 0
+
+    def detect(self, gray, cascade, min_size, region=None):
+        """Return face boxes for this grayscale frame, in its own coordinates
+
+        region limits the full-frame pass to a bounding box, e.g. from skin_region.
+        """
+        if gray.shape != self.frame_shape:
+            self.boxes = []
+            self.frame_shape = gray.shape
+
+        self.frames_since_full += 1
+        if self.boxes and self.frames_since_full < self.interval:
+            tracked = self._redetect_near_boxes(gray, cascade)
+            if tracked is not None:
+                self.boxes = tracked
+                self.tracked_frames += 1
+                return tracked
+
+        self.boxes = _detect_in_region(gray, cascade, min_size, region)
+        self.frames_since_full = 0
+        self.full_detections += 1
+        return self.boxes
+
+    def _redetect_near_boxes(self, gray, cascade):
+        height, width = gray.shape[:2]
+        tracked = []
+
+        for (x, y, w, h) in self.boxes:
+            pad_x, pad_y = int(w * self.margin), int(h * self.margin)
+            x0, y0 = max(0, x - pad_x), max(0, y - pad_y)
+            x1, y1 = min(width, x + w + pad_x), min(height, y + h + pad_y)
+
+            found = cascade.detectMultiScale(
+                gray[y0:y1, x0:x1], DETECTOR_CONFIG['scale_factor'], DETECTOR_CONFIG['min_neighbors'],
+                minSize=(int(w * 0.7), int(h * 0.7)),
+                maxSize=(int(w * 1.4), int(h * 1.4))
+            )
+            if len(found) == 0:
+                return None
+
+            # Keep the candidate closest to where the face was
+            cx, cy = x + w / 2, y + h / 2
+            fx, fy, fw, fh = min(
+                found,
+                key=lambda f: (x0 + f[0] + f[2] / 2 - cx) ** 2 + (y0 + f[1] + f[3] / 2 - cy) ** 2
+            )
+            box = (int(x0 + fx), int(y0 + fy), int(fw), int(fh))
+
+            if any(_overlap(box, other) > 0.5 for other in tracked):
+                return None
+            tracked.append(box)
+
+        return tracked
+
+def _overlap(a, b):
+    """Intersection over union of two (x, y, w, h) boxes"""
+    ix = max(0, min(a[0] + a[2], b[0] + b[2]) - max(a[0], b[0]))
+    iy = max(0, min(a[1] + a[3], b[1] + b[3]) - max(a[1], b[1]))
+    inter = ix * iy
+    union = a[2] * a[3] + b[2] * b[3] - inter
+    return inter / union if union else 0.0
+
+def detect_faces_in_image(image_bytes, downscale=None, min_face_size=None, tracker=None, gate=None,
+                          skin_prefilter=None):
+    """Decode one encoded frame and return its face boxes as (x, y, w, h) in original coordinates
+
+    With a MotionGate, frames that match the last processed one reuse its result.
+    The opt-in skin prefilter limits the cascade to the area around skin-coloured
+    pixels; frames without any search in full.
+    With a FaceTracker, the full cascade only runs every few frames for that stream.
+    """
+    downscale = downscale or DEFAULT_DOWNSCALE
+    min_face_size = min_face_size or DEFAULT_MIN_FACE_SIZE
+    if skin_prefilter is None:
+        skin_prefilter = SKIN_PREFILTER_ENABLED
+
+    gray, bgr = decode_frame(image_bytes, downscale, color=skin_prefilter)
+
+    if gate is not None:
+        cached = gate.cached_faces(gray)
+        if cached is not None:
+            return cached
+
+    region = skin_region(bgr) if skin_prefilter else None
+
+    # The Haar window is 24x24, so never ask for smaller faces on the reduced image
+    min_size = max(24, min_face_size // downscale)
+    if tracker is not None:
+        faces = tracker.detect(gray, get_cascade(), min_size, region)
+    else:
+        faces = _detect_in_region(gray, get_cascade(), min_size, region)
+    faces = [tuple(int(v) * downscale for v in face) for face in faces]
+
+    if gate is not None:
+        gate.store(faces)
+    return faces
+
+class EngineSaturated(Exception):
+    """Raised when the detection queue is full; retry_after is a hint in seconds"""
+
+    def __init__(self, retry_after):
+        super().__init__('Face detection is at capacity, retry later')
+        self.retry_after = retry_after
+
+class DetectionEngine:
+    """Bounded pool of detection worker threads
+
+    Each worker owns its own CascadeClassifier. Work waits in a bounded queue;
+    when the queue is full new work is rejected with EngineSaturated instead of
+    piling up, so callers can shed load (HTTP 429) rather than time out.
+    OpenCV releases the GIL inside detectMultiScale, so threads scale across cores.
+    """
+
+    def __init__(self, workers=None, queue_size=None):
+        self.workers = workers or int(os.environ.get('FACE_DETECT_WORKERS', os.cpu_count() or 4))
+        self.queue_size = queue_size or int(os.environ.get('FACE_DETECT_QUEUE', self.workers * 8))
+        self._queue = deque()
+        self._cond = threading.Condition()
+        self._avg_service_time = 0.05
+        self.rejected = 0
+
+        if self.workers > 1:
+            # Parallelism comes from the workers; stop OpenCV from also fanning out per call
+            cv2.setNumThreads(1)
+
+        for i in range(self.workers):
+            threading.Thread(target=self._worker, name=f'face-detect-{i}', daemon=True).start()
+
+    def submit_many(self, calls):
+        """Queue (func, args) calls all together or not at all; returns one Future per call"""
+        with self._cond:
+            if len(self._queue) + len(calls) > self.queue_size:
+                self.rejected += 1
+                raise EngineSaturated(self._retry_after(len(calls)))
+
+            futures = []
+            for func, args in calls:
+                future = Future()
+                self._queue.append((future, func, args))
+                futures.append(future)
+            self._cond.notify(len(calls))
+            return futures
+
+    def submit(self, func, *args):
+        return self.submit_many([(func, args)])[0]
+
+    def run(self, func, *args):
+        """Run func on a worker and wait for its result"""
+        return self.submit(func, *args).result()
+
+    def map_ordered(self, func, items):
+        """Apply func to each item on the workers; returns results or the exception, in input order"""
+        futures = self.submit_many([(func, (item,)) for item in items])
+
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                results.append(e)
+        return results
+
+    def stats(self):
+        with self._cond:
+            return {
+                'workers': self.workers,
+                'queue_size': self.queue_size,
+                'queued': len(self._queue),
+                'rejected': self.rejected,
+                'avg_service_ms': round(self._avg_service_time * 1000, 2)
+            }
+
+    def _retry_after(self, extra):
+        """Seconds until roughly `extra` queue slots free up"""
+        backlog = len(self._queue) + extra - self.queue_size
+        return max(1, math.ceil(backlog * self._avg_service_time / self.workers))
+
+    def _worker(self):
+        get_cascade()  # Load this worker's classifier before taking work
+        while True:
+            with self._cond:
+                while not self._queue:
+                    self._cond.wait()
+                future, func, args = self._queue.popleft()
+
+            if not future.set_running_or_notify_cancel():
+                continue
+
+            start = time.perf_counter()
+            try:
+                future.set_result(func(*args))
+            except Exception as e:
+                future.set_exception(e)
+
+            elapsed = time.perf_counter() - start
+            with self._cond:
+                self._avg_service_time = 0.9 * self._avg_service_time + 0.1 * elapsed
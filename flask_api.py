@@ -1,62 +1,260 @@
 from flask import Flask, request, jsonify
 from flask_cors import CORS
-import cv2
-import numpy as np
+from flask_sock import Sock
+from simple_websocket import ConnectionClosed
 import base64
+import json
+import time
+from collections import deque
+from face_engine import DETECTOR_CONFIG, DetectionEngine, EngineSaturated, FaceTracker, MotionGate, detect_faces_in_image
+from proctoring import FrameCounters, SessionStore
 
 app = Flask(__name__)
 CORS(app)
+sock = Sock(app)
 
-# Use OpenCV's built-in face detector as fallback
-face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
-consecutive_multiple_faces = 0
+# Bounded pool of detection workers, each with its own Haar cascade
+detection_engine = DetectionEngine()
+MAX_BATCH_FRAMES = 64
 
-@app.route('/api/detect-faces', methods=['POST'])
-def detect_faces():
-    global consecutive_multiple_faces
-    try:
-        # Get image from request
+# Per-candidate violation counters, face trackers and motion gates, dropped after 5 minutes without frames
+proctoring_sessions = SessionStore(
+    idle_timeout=300, threshold_frames=DETECTOR_CONFIG['face_threshold_frames'],
+    tracker_factory=FaceTracker, gate_factory=MotionGate
+)
+frame_counters = FrameCounters()
+
+# Content types accepted as a raw encoded frame in the request body
+BINARY_FRAME_TYPES = ('image/jpeg', 'image/png', 'image/webp', 'application/octet-stream')
+
+def read_frame():
+    """Return (session_id, encoded image buffer) from a JSON, raw or multipart upload"""
+    if request.mimetype in BINARY_FRAME_TYPES:
+        # Raw bytes: decode the request body in place, no base64 round trip
+        session_id = request.args.get('session_id') or request.headers.get('X-Session-Id')
+        image_bytes = request.get_data(cache=False)
+    elif request.mimetype == 'multipart/form-data':
+        session_id = request.form.get('session_id') or request.args.get('session_id')
+        image_bytes = request.files['frame'].read()
+    else:
         data = request.json
+        session_id = data.get('session_id')
         image_data = data['image'].split(',')[1]  # Remove data:image/jpeg;base64,
-        
-        # Decode base64 image
         image_bytes = base64.b64decode(image_data)
-        nparr = np.frombuffer(image_bytes, np.uint8)
-        frame = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-        
-        # Convert to grayscale for face detection
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        
-        # Detect faces
-        faces = face_cascade.detectMultiScale(gray, 1.1, 4)
+
+    return session_id or request.remote_addr, image_bytes
+
+def process_frame(session_id, image_bytes):
+    """Detect faces in one frame of a session's stream and return the response payload"""
+    session = proctoring_sessions.get(session_id)
+    with session.pipeline_lock:
+        faces = detect_faces_in_image(image_bytes, tracker=session.tracker, gate=session.gate)
+        frame_counters.add(skipped=session.gate.consecutive_skips > 0)
         face_count = len(faces)
-        
+
         # Check for violations
-        if face_count > 1:
-            consecutive_multiple_faces += 1
-        else:
-            consecutive_multiple_faces = 0
-            
-        violation = consecutive_multiple_faces >= 5
-        
-        # Format face coordinates for frontend
-        face_list = []
-        for (x, y, w, h) in faces:
-            face_list.append({
-                'x': int(x), 'y': int(y), 
-                'width': int(w), 'height': int(h)
-            })
-        
-        return jsonify({
-            'face_count': face_count,
-            'faces': face_list,
-            'consecutive_count': consecutive_multiple_faces,
-            'violation': violation,
-            'reason': 'Multiple faces detected' if violation else 'OK'
+        state = session.record(face_count)
+    violation = state['violation']
+
+    # Format face coordinates for frontend
+    face_list = []
+    for (x, y, w, h) in faces:
+        face_list.append({
+            'x': int(x), 'y': int(y),
+            'width': int(w), 'height': int(h)
         })
-        
+
+    return {
+        'face_count': face_count,
+        'faces': face_list,
+        'consecutive_count': state['consecutive_count'],
+        'violation': violation,
+        'reason': 'Multiple faces detected' if violation else 'OK'
+    }
+
+def process_session_frames(frames):
+    """Process one session's frames in order; returns a result or error payload per frame
+
+    Frames from a JSON batch arrive still base64-encoded and are decoded here,
+    so a malformed frame only fails its own entry.
+    """
+    results = []
+    for session_id, image in frames:
+        try:
+            image_bytes = base64.b64decode(image.split(',')[-1]) if isinstance(image, str) else image
+            result = process_frame(session_id, image_bytes)
+        except Exception as e:
+            result = {'error': str(e)}
+        result['session_id'] = session_id
+        results.append(result)
+    return results
+
+def read_frame_batch():
+    """Return a list of (session_id, encoded image buffer or base64 string) from a multipart or JSON batch"""
+    if request.mimetype == 'multipart/form-data':
+        default_session = request.form.get('session_id') or request.remote_addr
+        files = request.files.getlist('frame')
+        session_ids = request.form.getlist('session_ids')
+        if session_ids and len(session_ids) != len(files):
+            raise ValueError('session_ids must match the number of frames')
+        return [
+            (session_ids[i] if session_ids else default_session, file.read())
+            for i, file in enumerate(files)
+        ]
+
+    data = request.json
+    default_session = data.get('session_id') or request.remote_addr
+    return [
+        (item.get('session_id') or default_session, item.get('image', ''))
+        for item in data['frames']
+    ]
+
+def saturated_response(error):
+    response = jsonify({'error': str(error), 'retry_after': error.retry_after})
+    response.headers['Retry-After'] = str(error.retry_after)
+    return response, 429
+
+@app.route('/api/detect-faces', methods=['POST'])
+def detect_faces():
+    """Detect faces in a frame sent as base64 JSON, raw image bytes or multipart 'frame'"""
+    try:
+        session_id, image_bytes = read_frame()
+        return jsonify(detection_engine.run(process_frame, session_id, image_bytes))
+
+    except EngineSaturated as e:
+        return saturated_response(e)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/detect-faces/batch', methods=['POST'])
+def detect_faces_batch():
+    """Detect faces in several frames, possibly from several sessions, in one request"""
+    try:
+        frames = read_frame_batch()
+        if len(frames) > MAX_BATCH_FRAMES:
+            return jsonify({'error': f'At most {MAX_BATCH_FRAMES} frames per batch'}), 413
+
+        # Tracking and violation counters depend on frame order, so each session's
+        # frames run in order on one worker while different sessions run in parallel
+        positions = {}
+        for index, (session_id, _) in enumerate(frames):
+            positions.setdefault(session_id, []).append(index)
+        if len(positions) > detection_engine.queue_size:
+            return jsonify({'error': f'At most {detection_engine.queue_size} sessions per batch'}), 413
+
+        session_results = detection_engine.map_ordered(
+            process_session_frames,
+            [[frames[i] for i in indexes] for indexes in positions.values()]
+        )
+
+        results = [None] * len(frames)
+        for indexes, outcome in zip(positions.values(), session_results):
+            for index, result in zip(indexes, outcome):
+                results[index] = result
+
+        return jsonify({'results': results})
+
+    except EngineSaturated as e:
+        return saturated_response(e)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def receive_latest_frame(ws, pending):
+    """Block for the next message; for a frame, drain the frames queued behind it and keep only the newest
+
+    Text (control) messages are never dropped: one found while draining is
+    held in the `pending` deque and returned by the next call.
+    Returns (message, number of stale frames dropped).
+    """
+    if pending:
+        return pending.popleft(), 0
+    message = ws.receive()
+    if isinstance(message, str):
+        return message, 0
+
+    dropped = 0
+    while True:
+        newer = ws.receive(timeout=0)
+        if newer is None:
+            return message, dropped
+        if isinstance(newer, str):
+            pending.append(newer)
+            continue
+        message = newer
+        dropped += 1
+
+@sock.route('/ws/detect-faces')
+def detect_faces_stream(ws):
+    """Stream binary JPEG frames in, detection results out
+
+    The server only ever works on the newest frame: anything that arrived
+    while the previous frame was being processed is dropped, so a slow server
+    falls behind by at most one frame instead of building a queue.
+    """
+    session_id = request.args.get('session_id') or request.remote_addr
+    frame_id = 0
+    dropped_frames = 0
+    pending = deque()
+
+    try:
+        while True:
+            message, dropped = receive_latest_frame(ws, pending)
+            dropped_frames += dropped
+
+            if isinstance(message, str):
+                # Text messages are control messages, e.g. {"type": "end"}
+                try:
+                    control = json.loads(message)
+                except ValueError:
+                    ws.send(json.dumps({'error': 'Invalid control message'}))
+                    continue
+                if isinstance(control, dict) and control.get('type') == 'end':
+                    proctoring_sessions.discard(session_id)
+                    break
+                continue
+
+            frame_id += 1
+            try:
+                result = detection_engine.run(process_frame, session_id, message)
+            except EngineSaturated as e:
+                # Drop this frame; the client keeps streaming and the next one may fit
+                result = {'error': str(e), 'retry_after': e.retry_after}
+            except Exception as e:
+                result = {'error': str(e)}
+
+            result['frame_id'] = frame_id
+            result['dropped_frames'] = dropped_frames
+            ws.send(json.dumps(result))
+    except ConnectionClosed:
+        pass
+
+@app.route('/api/detect-faces/stats', methods=['GET'])
+def detect_faces_stats():
+    """Processed vs motion-skipped frame counters, service-wide and per session"""
+    stats = frame_counters.snapshot()
+    stats['active_sessions'] = len(proctoring_sessions)
+    stats['engine'] = detection_engine.stats()
+    stats['process_cpu_seconds'] = time.process_time()
+
+    session_id = request.args.get('session_id')
+    session = proctoring_sessions.find(session_id) if session_id else None
+    if session:
+        gate = session.gate
+        stats['session'] = {
+            'session_id': session_id,
+            'processed_frames': gate.processed,
+            'skipped_frames': gate.skipped
+        }
+
+    return jsonify(stats)
+
+@app.route('/api/end-session', methods=['POST'])
+def end_session():
+    data = request.json or {}
+    session_id = data.get('session_id')
+    if session_id:
+        proctoring_sessions.discard(session_id)
+    return jsonify({'message': 'Session ended'})
+
 if __name__ == '__main__':
-    app.run(debug=True, port=5000)
\ No newline at end of file
+    app.run(debug=True, port=5000, threaded=True)
@@ -1,13 +1,22 @@
-from flask import Flask, request, jsonify, session
+from flask import Flask, request, jsonify, session, Response, stream_with_context
 from flask_cors import CORS
-import requests
 import os
+import sys
 import uuid
+import json
+from datetime import datetime
 from werkzeug.utils import secure_filename
-import pytesseract
-from PIL import Image
-import fitz  
-from docx import Document
+
+# Shared helpers (LLM client) live with the AIGNITE apps
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'AIGNITE', 'AIGNITE'))
+from llm_client import GroqClient, LLMStreamError
+from llm_cache import cache_from_env
+from llm_scheduler import scheduler_from_env
+from llm_usage import usage_from_env
+from resume_cache import resume_cache_from_env, upload_store_from_env
+from resume_parser import RESUME_TEXT_CHARS, RESUME_TEXT_KEY, resume_text
+from ocr_jobs import ocr_queue_from_env
+from conversation_window import ConversationWindow
 
 app = Flask(__name__)
 CORS(app)
@@ -15,74 +24,33 @@ app.secret_key = 'your-secret-key-for-interview-bot'
 app.config['UPLOAD_FOLDER'] = 'uploads'
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024
 
-if not os.path.exists('uploads'):
-    os.makedirs('uploads')
+# Pooled Groq client shared by every route; opening questions are served from the response cache
+groq_client = GroqClient(key_path='AIGNITE/key.txt', max_tokens=150, cache=cache_from_env(),
+                         scheduler=scheduler_from_env(), usage=usage_from_env())
+
+# Text already extracted from identical uploads, keyed by content hash
+resume_cache = resume_cache_from_env()
+
+# Optional content-addressed copies of uploads; parsing itself never touches the disk
+upload_store = upload_store_from_env(app.config['UPLOAD_FOLDER'])
+
+# Process pool for OCR of image and scanned-PDF resumes, with per-page and per-job timeouts
+ocr_queue = ocr_queue_from_env()
 
 # Store active sessions
 active_sessions = {}
 
-def load_api_key():
-    try:
-        with open('AIGNITE/key.txt', 'r') as f:
-            return f.read().strip().replace('API: ', '')
-    except:
-        return None
-
-def extract_text_from_file(filepath):
-    filename = os.path.basename(filepath).lower()
-    
-    if filename.endswith('.txt'):
-        with open(filepath, 'r', encoding='utf-8') as f:
-            return f.read()
-    
-    elif filename.endswith('.pdf'):
-        doc = fitz.open(filepath)
-        text = ""
-        for page in doc:
-            text += page.get_text()
-        return text
-    
-    elif filename.endswith('.docx'):
-        doc = Document(filepath)
-        text = ""
-        for paragraph in doc.paragraphs:
-            text += paragraph.text + "\n"
-        return text
-    
-    elif filename.endswith(('.png', '.jpg', '.jpeg', '.bmp', '.tiff')):
-        image = Image.open(filepath)
-        return pytesseract.image_to_string(image)
-    
-    else:
-        return f"Unsupported file format: {filename}"
+# Chat history sent per turn: system prompt, a summary of older turns and the last few exchanges
+CHAT_KEEP_EXCHANGES = int(os.environ.get('CHAT_KEEP_EXCHANGES', '3'))
+CHAT_TOKEN_BUDGET = int(os.environ.get('CHAT_TOKEN_BUDGET', '1500'))
+FOLLOW_UP_PROMPT = "Ask a relevant follow-up question or move to the next topic. Keep it concise and professional."
 
-def groq_chat(messages, api_key=None):
-    if not api_key:
-        api_key = load_api_key()
-    
-    if not api_key:
-        return {'error': {'message': 'API key not found', 'type': 'api_key_error'}}
-    
-    url = "https://api.groq.com/openai/v1/chat/completions"
-    headers = {
-        "Authorization": f"Bearer {api_key}",
-        "Content-Type": "application/json"
-    }
-    
-    data = {
-        "messages": messages,
-        "model": "llama-3.1-8b-instant",
-        "temperature": 0.7,
-        "max_tokens": 150
-    }
-    
-    try:
-        response = requests.post(url, headers=headers, json=data, timeout=30)
-        return response.json()
-    except requests.exceptions.Timeout:
-        return {'error': {'message': 'Request timed out. Please try again.', 'type': 'timeout'}}
-    except requests.exceptions.ConnectionError:
-        return {'error': {'message': 'Connection failed. Please check your internet connection.', 'type': 'connection_error'}}
+def read_resume(data, filename):
+    """Start of the resume text; images and scanned pages are OCR'd in the OCR worker pool"""
+    text = resume_text(data, filename, skip_scanned=ocr_queue is not None)
+    if text is None:
+        return ocr_queue.extract(data, filename, RESUME_TEXT_CHARS)
+    return text
 
 @app.route('/api/start-interview', methods=['POST'])
 def start_interview():
@@ -99,12 +67,16 @@ def start_interview():
         if file.filename == '':
             return jsonify({'error': 'No file selected'}), 400
         
-        # Save and process resume
+        # Process the resume from memory; keep a copy only if the upload store is enabled
         filename = secure_filename(file.filename)
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        file.save(filepath)
+        data = file.read()
+        if upload_store:
+            upload_store.save(data, filename)
         
-        resume_content = extract_text_from_file(filepath)
+        if resume_cache:
+            resume_content = resume_cache.extract(data, filename, read_resume, extractor=RESUME_TEXT_KEY)
+        else:
+            resume_content = read_resume(data, filename)
         
         # Create session
         session_id = str(uuid.uuid4())
@@ -125,19 +97,21 @@ def start_interview():
             'role': role,
             'type': interview_type,
             'resume_content': resume_content,
-            'messages': [{"role": "system", "content": system_prompt}],
+            'conversation': ConversationWindow(system_prompt, keep_exchanges=CHAT_KEEP_EXCHANGES,
+                                               token_budget=CHAT_TOKEN_BUDGET),
             'question_count': 0
         }
+        conversation = active_sessions[session_id]['conversation']
         
         # Generate first question
         first_question_prompt = f"Start the {interview_type} interview with a greeting and first question. Be professional and concise."
-        active_sessions[session_id]['messages'].append({"role": "user", "content": first_question_prompt})
+        conversation.append("user", first_question_prompt)
         
-        result = groq_chat(active_sessions[session_id]['messages'])
+        result = groq_client.chat(conversation.messages(), session_id=session_id, call_site='first_question')
         
         if 'choices' in result and len(result['choices']) > 0:
             first_question = result['choices'][0]['message']['content']
-            active_sessions[session_id]['messages'].append({"role": "assistant", "content": first_question})
+            conversation.append("assistant", first_question)
             active_sessions[session_id]['question_count'] = 1
             
             return jsonify({
@@ -164,7 +138,7 @@ def chat():
         session_data = active_sessions[session_id]
         
         # Add user message
-        session_data['messages'].append({"role": "user", "content": user_message})
+        session_data['conversation'].append("user", user_message)
         
         # Check if interview should end
         if session_data['question_count'] >= 5:
@@ -175,20 +149,20 @@ def chat():
         
         # Generate follow-up or next question
         if session_data['question_count'] < 5:
-            follow_up_prompt = f"Ask a relevant follow-up question or move to the next topic. Keep it concise and professional."
-            session_data['messages'].append({"role": "system", "content": follow_up_prompt})
-            
-            result = groq_chat(session_data['messages'])
+            # Sent with this request only, so follow-up instructions don't pile up in the history
+            result = groq_client.chat(session_data['conversation'].messages(FOLLOW_UP_PROMPT), use_cache=False,
+                                      session_id=session_id, call_site='follow_up')
             
             if 'choices' in result and len(result['choices']) > 0:
                 ai_response = result['choices'][0]['message']['content']
-                session_data['messages'].append({"role": "assistant", "content": ai_response})
+                session_data['conversation'].append("assistant", ai_response)
                 session_data['question_count'] += 1
                 
                 return jsonify({
                     'message': ai_response,
                     'question_count': session_data['question_count'],
-                    'total_questions': 5
+                    'total_questions': 5,
+                    'context_tokens': session_data['conversation'].token_count(FOLLOW_UP_PROMPT)
                 })
             else:
                 return jsonify({'error': f'Failed to generate response: {result}'}), 500
@@ -196,6 +170,64 @@ def chat():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/chat/stream', methods=['POST'])
+def chat_stream():
+    """Same as /api/chat, but relays the reply as server-sent events
+    
+    Emits `token` events while the reply streams in, then a `done` event with
+    the JSON /api/chat would have returned (or an `error` event).
+    """
+    data = request.json
+    session_id = data.get('session_id')
+    user_message = data.get('message', '').strip()
+    
+    if not session_id or session_id not in active_sessions:
+        return jsonify({'error': 'Invalid or expired session'}), 400
+    
+    session_data = active_sessions[session_id]
+    session_data['conversation'].append("user", user_message)
+    
+    def events():
+        if session_data['question_count'] >= 5:
+            yield sse_event('done', {
+                'message': 'Thank you for your time. The interview is now complete. We will get back to you soon.',
+                'interview_complete': True
+            })
+            return
+        
+        parts = []
+        completed = False
+        try:
+            for token in groq_client.stream_chat(session_data['conversation'].messages(FOLLOW_UP_PROMPT),
+                                                 use_cache=False, session_id=session_id, call_site='follow_up'):
+                parts.append(token)
+                yield sse_event('token', {'text': token})
+            completed = True
+        except LLMStreamError as e:
+            yield sse_event('error', {'error': f'Failed to generate response: {e.error}'})
+            return
+        finally:
+            # Client gone or generation failed: forget the answer so it can be sent again
+            if not completed:
+                session_data['conversation'].discard_pending()
+        
+        ai_response = ''.join(parts)
+        session_data['conversation'].append("assistant", ai_response)
+        session_data['question_count'] += 1
+        
+        yield sse_event('done', {
+            'message': ai_response,
+            'question_count': session_data['question_count'],
+            'total_questions': 5,
+            'context_tokens': session_data['conversation'].token_count(FOLLOW_UP_PROMPT)
+        })
+    
+    return Response(stream_with_context(events()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+def sse_event(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
 @app.route('/api/end-interview', methods=['POST'])
 def end_interview():
     try:
@@ -220,10 +252,25 @@ def get_session_status(session_id):
             'company': session_data['company'],
             'role': session_data['role'],
             'type': session_data['type'],
-            'question_count': session_data['question_count']
+            'question_count': session_data['question_count'],
+            'context_tokens': session_data['conversation'].token_count(FOLLOW_UP_PROMPT),
+            'llm_usage': groq_client.usage.session(session_id)
         })
     else:
         return jsonify({'active': False}), 404
 
+@app.route('/api/metrics', methods=['GET'])
+def metrics():
+    """LLM token, latency and cost totals by call site, plus cache, scheduler and resume cache stats"""
+    return jsonify({
+        'timestamp': datetime.now().isoformat(),
+        'active_sessions': len(active_sessions),
+        'llm_usage': groq_client.usage.snapshot(),
+        'llm_cache': groq_client.cache.stats() if groq_client.cache else None,
+        'llm_scheduler': groq_client.scheduler.stats(),
+        'resume_cache': resume_cache.stats() if resume_cache else None,
+        'ocr_queue': ocr_queue.stats() if ocr_queue else None
+    })
+
 if __name__ == '__main__':
     app.run(debug=True, port=8000)
\ No newline at end of file
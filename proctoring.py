@@ -0,0 +1,109 @@
+import threading
+import time
+
+
+class ProctoringSession:
+    """Violation state for one candidate's webcam stream"""
+
+    def __init__(self, session_id, threshold_frames=5, tracker=None, gate=None):
+        self.session_id = session_id
+        self.threshold_frames = threshold_frames
+        self.consecutive_multiple_faces = 0
+        self.last_seen = time.monotonic()
+        self.lock = threading.Lock()
+
+        # Detection state carried between frames; frames of one stream run one at a time
+        self.tracker = tracker
+        self.gate = gate
+        self.pipeline_lock = threading.Lock()
+
+    def record(self, face_count):
+        """Update the multiple-face counter with one frame's result"""
+        with self.lock:
+            if face_count > 1:
+                self.consecutive_multiple_faces += 1
+            else:
+                self.consecutive_multiple_faces = 0
+            self.last_seen = time.monotonic()
+
+            return {
+                'consecutive_count': self.consecutive_multiple_faces,
+                'violation': self.consecutive_multiple_faces >= self.threshold_frames
+            }
+
+
+class SessionStore:
+    """Thread-safe map of session id -> ProctoringSession with idle eviction"""
+
+    def __init__(self, idle_timeout=300, threshold_frames=5, sweep_interval=30,
+                 tracker_factory=None, gate_factory=None):
+        self.idle_timeout = idle_timeout
+        self.threshold_frames = threshold_frames
+        self.tracker_factory = tracker_factory
+        self.gate_factory = gate_factory
+        self.sweep_interval = sweep_interval
+        self._sessions = {}
+        self._lock = threading.Lock()
+        self._last_sweep = time.monotonic()
+
+    def get(self, session_id):
+        """Return the session for this id, creating it if needed"""
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_sweep >= self.sweep_interval:
+                self._evict_idle(now)
+
+            session = self._sessions.get(session_id)
+            if session is None:
+                tracker = self.tracker_factory() if self.tracker_factory else None
+                gate = self.gate_factory() if self.gate_factory else None
+                session = ProctoringSession(session_id, self.threshold_frames, tracker, gate)
+                self._sessions[session_id] = session
+            return session
+
+    def find(self, session_id):
+        """Return the session for this id, or None if it is not tracked"""
+        with self._lock:
+            return self._sessions.get(session_id)
+
+    def discard(self, session_id):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._sessions)
+
+    def _evict_idle(self, now):
+        expired = [
+            sid for sid, session in self._sessions.items()
+            if now - session.last_seen > self.idle_timeout
+        ]
+        for sid in expired:
+            del self._sessions[sid]
+        self._last_sweep = now
+
+
+class FrameCounters:
+    """Service-wide processed vs skipped frame counts, for capacity planning"""
+
+    def __init__(self):
+        self.processed = 0
+        self.skipped = 0
+        self._lock = threading.Lock()
+
+    def add(self, skipped):
+        with self._lock:
+            if skipped:
+                self.skipped += 1
+            else:
+                self.processed += 1
+
+    def snapshot(self):
+        with self._lock:
+            total = self.processed + self.skipped
+            return {
+                'processed_frames': self.processed,
+                'skipped_frames': self.skipped,
+                'skip_ratio': round(self.skipped / total, 4) if total else 0.0
+            }
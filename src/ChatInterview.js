@@ -5,6 +5,43 @@ import Squares from './Squares';
 import FaceDetector from './FaceDetector';
 import './ChatInterview.css';
 
+// Poll an OCR job from start-interview (image or scanned resumes) until the interview has started
+const waitForOcrJob = async (statusUrl) => {
+  while (true) {
+    await new Promise((resolve) => setTimeout(resolve, 1000));
+    const job = await (await fetch(`http://localhost:5000${statusUrl}`)).json();
+    if (job.status === 'done') return { ok: !job.result?.error, result: job.result };
+    if (job.status === 'failed' || job.error) return { ok: false, result: { error: job.error } };
+  }
+};
+
+// Read a text/event-stream response, calling onEvent(event, data) for each message
+const readEventStream = async (response, onEvent) => {
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+
+  while (true) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+
+    let boundary;
+    while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+      const block = buffer.slice(0, boundary);
+      buffer = buffer.slice(boundary + 2);
+
+      let event = 'message';
+      let data = '';
+      block.split('\n').forEach((line) => {
+        if (line.startsWith('event:')) event = line.slice(6).trim();
+        else if (line.startsWith('data:')) data += line.slice(5).trim();
+      });
+      if (data) onEvent(event, JSON.parse(data));
+    }
+  }
+};
+
 const ChatInterview = () => {
   const location = useLocation();
   const navigate = useNavigate();
@@ -16,6 +53,7 @@ const ChatInterview = () => {
   const [sessionId, setSessionId] = useState(null);
   const [currentQuestionInfo, setCurrentQuestionInfo] = useState('');
   const [summary, setSummary] = useState(null);
+  const [streamingText, setStreamingText] = useState('');
   const messagesEndRef = useRef(null);
 
   const menuItems = [
@@ -103,9 +141,13 @@ const ChatInterview = () => {
         body: formData
       });
 
-      const result = await response.json();
-      
-      if (response.ok) {
+      let result = await response.json();
+      let ok = response.ok;
+      if (response.status === 202) {
+        ({ ok, result } = await waitForOcrJob(result.status_url));
+      }
+
+      if (ok) {
         setSessionId(result.session_id);
         
         // Add welcome message
@@ -156,7 +198,7 @@ const ChatInterview = () => {
     setIsLoading(true);
 
     try {
-      const response = await fetch(`http://localhost:5000/api/submit-answer/${sessionId}`, {
+      const response = await fetch(`http://localhost:5000/api/submit-answer/${sessionId}/stream`, {
         method: 'POST',
         headers: {
           'Content-Type': 'application/json'
@@ -164,9 +206,24 @@ const ChatInterview = () => {
         body: JSON.stringify({ answer: inputMessage })
       });
 
-      const result = await response.json();
-      
+      // Show the next question as it streams in; the done event carries the usual result
+      let result;
       if (response.ok) {
+        let streamed = '';
+        await readEventStream(response, (event, data) => {
+          if (event === 'token') {
+            streamed += data.text;
+            setStreamingText(streamed);
+          } else if (event === 'done') {
+            result = data;
+          }
+        });
+      } else {
+        result = await response.json();
+      }
+      setStreamingText('');
+      
+      if (response.ok && result && !result.error) {
         if (result.completed) {
           // Interview completed
           setInterviewEnded(true);
@@ -211,11 +268,12 @@ const ChatInterview = () => {
           setCurrentQuestionInfo(result.question_info);
         }
       } else {
-        console.error('Chat error:', result.error);
+        console.error('Chat error:', result && result.error);
       }
     } catch (error) {
       console.error('Error sending message:', error);
     } finally {
+      setStreamingText('');
       setIsLoading(false);
     }
   };
@@ -416,11 +474,20 @@ const ChatInterview = () => {
             {isLoading && (
               <div className="message ai">
                 <div className="message-content">
-                  <div className="typing-indicator">
-                    <span></span>
-                    <span></span>
-                    <span></span>
-                  </div>
+                  {streamingText ? (
+                    <>
+                      <div className="message-sender">Interviewer</div>
+                      <p style={{ color: '#ffffff', margin: '0 0 10px 0', lineHeight: '1.6', whiteSpace: 'pre-wrap' }}>
+                        {streamingText}
+                      </p>
+                    </>
+                  ) : (
+                    <div className="typing-indicator">
+                      <span></span>
+                      <span></span>
+                      <span></span>
+                    </div>
+                  )}
                 </div>
               </div>
             )}
@@ -7,6 +7,11 @@ const FaceDetector = ({ onViolation }) => {
   const [violation, setViolation] = useState(false);
   const [consecutiveCount, setConsecutiveCount] = useState(0);
   const [violationTriggered, setViolationTriggered] = useState(false);
+  const sessionIdRef = useRef(
+    window.crypto && window.crypto.randomUUID
+      ? window.crypto.randomUUID()
+      : `${Date.now()}-${Math.random().toString(36).slice(2)}`
+  );
 
   useEffect(() => {
     startCamera();
@@ -21,6 +26,31 @@ const FaceDetector = ({ onViolation }) => {
     };
   }, [violationTriggered]);
 
+  const socketRef = useRef(null);
+  const handleResultRef = useRef(null);
+
+  useEffect(() => {
+    // Stream frames over a WebSocket; fall back to HTTP posts if it is not open
+    const socket = new WebSocket(`ws://localhost:5000/ws/detect-faces?session_id=${sessionIdRef.current}`);
+    socket.onmessage = event => handleResultRef.current(JSON.parse(event.data));
+    socketRef.current = socket;
+
+    // Release the server-side violation counter when the interview ends
+    return () => {
+      if (socket.readyState === WebSocket.OPEN) {
+        socket.send(JSON.stringify({ type: 'end' }));
+        socket.close();
+        return;
+      }
+      socket.close();
+      fetch('http://localhost:5000/api/end-session', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ session_id: sessionIdRef.current })
+      }).catch(() => {});
+    };
+  }, []);
+
   const startCamera = async () => {
     try {
       const stream = await navigator.mediaDevices.getUserMedia({ 
@@ -53,42 +83,56 @@ const FaceDetector = ({ onViolation }) => {
     // Draw video frame
     ctx.drawImage(videoRef.current, 0, 0, 320, 240);
     
-    // Convert to base64 and send to Python API
-    const imageData = canvas.toDataURL('image/jpeg', 0.8);
+    // Encode as JPEG and send the raw bytes to the Python API
+    const imageBlob = await new Promise(resolve => canvas.toBlob(resolve, 'image/jpeg', 0.8));
+    if (!imageBlob) return;
+    
+    const socket = socketRef.current;
+    if (socket && socket.readyState === WebSocket.OPEN) {
+      socket.send(imageBlob);
+      return;
+    }
     
     try {
-      const response = await fetch('http://localhost:5000/api/detect-faces', {
+      const response = await fetch(`http://localhost:5000/api/detect-faces?session_id=${sessionIdRef.current}`, {
         method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({ image: imageData })
+        headers: { 'Content-Type': 'image/jpeg' },
+        body: imageBlob
       });
       
-      const result = await response.json();
-      setFaceCount(result.face_count);
-      setConsecutiveCount(result.consecutive_count);
-      setViolation(result.violation);
-      
-      // Trigger violation callback only once
-      if (result.violation && onViolation && !violationTriggered) {
-        setViolationTriggered(true);
-        onViolation();
-        return; // Stop further processing
-      }
-      
-      // Draw face boxes
-      if (result.faces) {
-        ctx.strokeStyle = result.face_count > 1 ? 'red' : 'green';
-        ctx.lineWidth = 2;
-        result.faces.forEach(face => {
-          ctx.strokeRect(face.x, face.y, face.width, face.height);
-        });
-      }
-      
+      handleResult(await response.json());
     } catch (error) {
       console.error('Detection failed:', error);
     }
   };
 
+  const handleResult = (result) => {
+    // Busy (429) or failed frames are skipped; the next frame will be sent shortly
+    if (violationTriggered || result.error) return;
+
+    setFaceCount(result.face_count);
+    setConsecutiveCount(result.consecutive_count);
+    setViolation(result.violation);
+    
+    // Trigger violation callback only once
+    if (result.violation && onViolation) {
+      setViolationTriggered(true);
+      onViolation();
+      return; // Stop further processing
+    }
+    
+    // Draw face boxes
+    if (result.faces) {
+      const ctx = canvasRef.current.getContext('2d');
+      ctx.strokeStyle = result.face_count > 1 ? 'red' : 'green';
+      ctx.lineWidth = 2;
+      result.faces.forEach(face => {
+        ctx.strokeRect(face.x, face.y, face.width, face.height);
+      });
+    }
+  };
+  handleResultRef.current = handleResult;
+
   return (
     <div className="face-detector">
       <video 